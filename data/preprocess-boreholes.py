@@ -5,11 +5,14 @@
 
 """Preprocess Bowdoin 2014 to 2017 borehole data."""
 
+import functools
 import os
 import gpxpy
 import numpy as np
 import pandas as pd
 import pyproj
+import scipy.signal as sg
+import xarray as xr
 
 
 # Global data
@@ -47,6 +50,7 @@ RECALIB_INTERVALS = dict(bh1=('2014-07-20 18:00', '2014-07-21 02:00'),
 def borehole_distances(upper='bh1', lower='bh3'):
     """
     Compute the time evolution of the distance between two boreholes.
+    Return a new series, safe to modify, from a cached result.
 
     Parameters
     ----------
@@ -55,6 +59,12 @@ def borehole_distances(upper='bh1', lower='bh3'):
     lower: string
         The name of the lower borehole.
     """
+    return _read_borehole_distances(upper, lower).copy()
+
+
+@functools.lru_cache
+def _read_borehole_distances(upper, lower):
+    """Read borehole distances once per pair (do not modify result)."""
     # FIXME: Borehole distances will become unnecessary when using RADAR data.
 
     # initialize empty data series
@@ -100,15 +110,28 @@ def borehole_distances(upper='bh1', lower='bh3'):
     return distances
 
 
-def borehole_thinning(uz, lz, distances):
-    """Estimate thinning based on distance between boreholes."""
+def borehole_thinning(uz, lz, distances, index=None):
+    """
+    Estimate thinning based on distance between boreholes, optionally
+    interpolated linearly in time onto a new (naive UTC) index.
+    """
     # FIXME: In practice this area conservation approach is not working.
     # FIXME: Besides one should include ice melt in the computation.
     dz = (uz+lz) / 2 * (distances.iloc[0]/distances-1)
+
+    # interpolate onto new index, constant outside observations
+    if index is not None:
+        index = pd.DatetimeIndex(index, name='date')
+        time = dz.index.tz_convert(None).to_numpy(dtype='datetime64[s]')
+        new = index.to_numpy(dtype='datetime64[s]')
+        dz = pd.Series(np.interp(new.astype(float), time.astype(float), dz),
+                       index=index)
+
+    # return thinning series
     return dz
 
 
-def borehole_base_evol(upper='bh1', lower='bh3'):
+def borehole_base_evol(upper='bh1', lower='bh3', index=None):
     """
     Compute the time evolution of the depths of two boreholes based on the
     evolution of the distance between the two boreholes and assuming
@@ -123,7 +146,7 @@ def borehole_base_evol(upper='bh1', lower='bh3'):
 
     # compute time-dependent depths
     distances = borehole_distances(upper=upper, lower=lower)
-    thinning = borehole_thinning(ubase, lbase, distances)
+    thinning = borehole_thinning(ubase, lbase, distances, index=index)
 
     # apply thinning and rename data series
     ubase = (thinning+ubase).rename(upper.upper()+'B')
@@ -185,7 +208,35 @@ def locate_piezometers(borehole, wlev):
     return depth
 
 
-def sensor_depths_evol(upper_dept, lower_dept, upper='bh1', lower='bh3'):
+def apply_thinning(depth, base, thinning, profile='uniform'):
+    """
+    Return time-dependent sensor depths in a data frame computed as an outer
+    product of thinning (time) and initial sensor depths (unit).
+
+    Parameters
+    ----------
+    depth: Series
+        Initial sensor depths.
+    base: scalar
+        Initial borehole depth.
+    thinning: Series
+        Time-dependent thinning (negative) or thickening (positive).
+    profile: string
+        Distribution of thinning with depth, 'uniform' for uniform vertical
+        strain, or 'surface' for thinning by surface lowering only.
+    """
+    dz = thinning.to_numpy()[:, None]
+    if profile == 'uniform':
+        values = depth.to_numpy() * (1+dz/base)
+    elif profile == 'surface':
+        values = depth.to_numpy() + dz
+    else:
+        raise ValueError(f"Invalid thinning profile {profile}.")
+    return pd.DataFrame(values, index=thinning.index, columns=depth.index)
+
+
+def sensor_depths_evol(upper_dept, lower_dept, upper='bh1', lower='bh3',
+                       index=None, profile='uniform'):
     """Return time-dependent sensor depths as data frames."""
 
     # get initial borebole depths
@@ -194,11 +245,11 @@ def sensor_depths_evol(upper_dept, lower_dept, upper='bh1', lower='bh3'):
 
     # compute time-dependent depths
     distances = borehole_distances(upper=upper, lower=lower)
-    thinning = borehole_thinning(ubase, lbase, distances)
+    thinning = borehole_thinning(ubase, lbase, distances, index=index)
 
     # apply thinning
-    upper_dept = thinning.apply(lambda d: upper_dept * (1+d/ubase))
-    lower_dept = thinning.apply(lambda d: lower_dept * (1+d/lbase))
+    upper_dept = apply_thinning(upper_dept, ubase, thinning, profile=profile)
+    lower_dept = apply_thinning(lower_dept, lbase, thinning, profile=profile)
 
     # return depth data series
     return upper_dept, lower_dept
@@ -282,21 +333,41 @@ def locate_thermistors():
 # Independent data reading methods
 # --------------------------------
 
-def read_gps_data(method='backward'):
-    """Return lon/lat gps positions in a data frame."""
+def read_rtklib_positions(filename):
+    """
+    Return lon/lat gps positions from an RTKLIB solution file in a data frame.
+    Columns are split on whitespace as their widths vary between files, and
+    header lines starting with % are skipped.
+    """
 
-    # check argument validity
-    assert method in ('backward', 'forward', 'central')
+    # read date, time, lat, lon and height as strings in a single pass
+    day, time, lat, lon, z = np.loadtxt(
+        filename, dtype=str, comments='%', usecols=range(5), ndmin=2).T
+    lat, lon, z = (col.astype(float) for col in (lat, lon, z))
+
+    # build iso dates accepting both slash and dash separators
+    dates = np.char.add(np.char.add(np.char.replace(day, '/', '-'), 'T'), time)
+    dates = pd.DatetimeIndex(dates.astype('datetime64[ms]'), name='date')
+
+    # return positions as a dataframe
+    return pd.DataFrame({'lat': lat, 'lon': lon, 'z': z}, index=dates)
+
+
+def read_gps_positions(cache='processed/bowdoin.bh1.gps.pkl'):
+    """
+    Return lon/lat and UTM gps positions in a data frame. Parsed positions are
+    cached in binary form and only re-parsed when the original files change.
+    """
+
+    # use cached positions if more recent than original files
+    files = ['original/gps/B14BH1/B14BH1_%d_15min.dat' % year
+             for year in [2014, 2015, 2016, 2017]]
+    if os.path.isfile(cache) and (
+            os.path.getmtime(cache) > max(map(os.path.getmtime, files))):
+        return pd.read_pickle(cache)
 
     # append dataframes corresponding to each year
-    names = ['daydate', 'time', 'lat', 'lon', 'z', 'Q', 'ns',
-             'sdn', 'sde', 'sdu', 'sdne', 'sdeu', 'sdun', 'age', 'ratio']
-    df = pd.concat([
-        pd.read_fwf('original/gps/B14BH1/B14BH1_%d_15min.dat' % year,
-                    names=names, index_col=0,
-                    usecols=['daydate', 'time', 'lon', 'lat', 'z'],
-                    parse_dates={'date': ['daydate', 'time']})
-        for year in [2014, 2015, 2016, 2017]])
+    df = pd.concat([read_rtklib_positions(filename) for filename in files])
 
     # find samples not taken at multiples of 15 min (900 sec) and remove them
     # it seems these (18) values were recorded directly after each data gap
@@ -311,20 +382,77 @@ def read_gps_data(method='backward'):
     # resample with 15 minute frequency and fill with NaN
     df = df.resample('15min').mean()
 
-    # compute cartesian velocity in meters per year
-    v = df[['x', 'y', 'z']]
-    if method == 'backward':
-        v = v.diff()
-    elif method == 'forward':
-        v = -v.diff(-1)
-    elif method == 'central':
-        v = (v.diff()-v.diff(-1))/2.0
-    v *= 60*24*365/15.0
-    v.columns = ['vx', 'vy', 'vz']
-    df = df.join(v)
+    # cache and return positions
+    df.to_pickle(cache)
+    return df
+
+
+def compute_gps_velocities(df, window=25):
+    """
+    Compute cartesian velocities in meters per year using backward, forward
+    and central differences, a Savitzky-Golay derivative, and a central
+    difference over a longer baseline, all in a single pass over the array.
+
+    Parameters
+    ----------
+    df: DataFrame
+        Positions x, y and z on a regular 15 minute index.
+    window: integer
+        Odd number of samples in the Savitzky-Golay filter window and
+        baseline of the long central difference.
+
+    Returns
+    -------
+    v: DataFrame
+        Velocity components vx, vy, vz and vh, with a column level for each
+        differencing scheme.
+    """
+
+    # check argument validity
+    if window < 3 or window % 2 == 0:
+        raise ValueError("Window must be an odd number of samples above 1.")
+
+    # positions as a (time, component) array, time step in years
+    xyz = df[['x', 'y', 'z']].to_numpy()
+    step = 15.0/60/24/365
+    half = window // 2
+
+    # compute all schemes in a (scheme, time, component) array
+    schemes = ['backward', 'forward', 'central', 'savgol', 'baseline']
+    v = np.full((len(schemes),) + xyz.shape, np.nan)
+    v[0, 1:] = (xyz[1:] - xyz[:-1]) / step
+    v[1, :-1] = v[0, 1:]
+    v[2] = (v[0] + v[1]) / 2.0
+    v[3, half:-half] = sg.savgol_filter(
+        xyz, 2*half+1, 2, deriv=1, delta=step, axis=0, mode='nearest'
+        )[half:-half]
+    v[4, half:-half] = (xyz[2*half:] - xyz[:-2*half]) / (2*half*step)
+
+    # add horizontal velocity and return as a dataframe
+    v = np.concatenate((v, (v[..., :2]**2).sum(axis=-1, keepdims=True)**0.5),
+                       axis=-1)
+    columns = pd.MultiIndex.from_product([schemes, ['vx', 'vy', 'vz', 'vh']])
+    return pd.DataFrame(v.transpose(1, 0, 2).reshape(len(df), -1),
+                        index=df.index, columns=columns)
+
+
+def read_gps_data(method='backward'):
+    """
+    Return lon/lat gps positions and velocities in a data frame. Velocities
+    computed with the given method are stored as vx, vy, vz and vh, and
+    horizontal velocities from all methods as vh_backward, vh_forward, etc.
+    """
+
+    # check argument validity
+    assert method in ('backward', 'forward', 'central', 'savgol', 'baseline')
+
+    # read positions and compute velocities
+    df = read_gps_positions()
+    v = compute_gps_velocities(df)
+    df = df.join(v[method])
+    df = df.join(v.xs('vh', axis=1, level=1).add_prefix('vh_'))
 
     # compute velocity polar coordinates
-    df['vh'] = (df['vx']**2 + df['vy']**2)**0.5
     df['azimuth'] = np.arctan2(df['vy'], df['vx']**2)*180/np.pi
     df['altitude'] = np.arctan2(df['vz'], df['vh'])*180/np.pi
 
@@ -529,6 +657,20 @@ def temperature_correction(borehole, temp, depth, clapeyron=CLAPEYRON,
     return melt_offset.squeeze()
 
 
+# Data export methods
+# -------------------
+
+def write_netcdf(data, filename):
+    """
+    Write a time series or data frame to a compressed netCDF file, with one
+    single-precision variable per column along the date dimension.
+    """
+    data = data.to_frame() if isinstance(data, pd.Series) else data
+    ds = data.astype('float32').rename_axis('date').to_xarray()
+    encoding = {var: dict(zlib=True, complevel=4) for var in ds.data_vars}
+    ds.to_netcdf(filename, encoding=encoding)
+
+
 # Main program
 # ------------
 
@@ -586,26 +728,34 @@ def main():
     bh3_thr_manu += bh3_thr_corr
     bh3_thr_temp += bh3_thr_corr
 
+    # evaluate depth evolution at the full sensor resolution
+    inc_index = bh1_inc.index.union(bh3_inc.index)
+    pzm_index = bh2_pzm.index.union(bh3_pzm.index)
+    thr_index = bh2_thr_temp.index.union(bh3_thr_temp.index)
+
     # compute borehole base evolution
     # FIXME: base depths should be independent of instrument type
-    bh1_inc_base, bh3_inc_base = borehole_base_evol(upper='bh1', lower='bh3')
-    bh2_pzm_base, bh3_pzm_base = borehole_base_evol(upper='bh2', lower='bh3')
-    bh2_thr_base, bh3_thr_base = borehole_base_evol(upper='bh2', lower='bh3')
+    bh1_inc_base, bh3_inc_base = borehole_base_evol(
+        upper='bh1', lower='bh3', index=inc_index)
+    bh2_pzm_base, bh3_pzm_base = borehole_base_evol(
+        upper='bh2', lower='bh3', index=pzm_index)
+    bh2_thr_base, bh3_thr_base = borehole_base_evol(
+        upper='bh2', lower='bh3', index=thr_index)
 
     # compute sensor depths evolution
     bh1_inc_dept, bh3_inc_dept = sensor_depths_evol(
-        bh1_inc_dept, bh3_inc_dept, upper='bh1', lower='bh3')
+        bh1_inc_dept, bh3_inc_dept, upper='bh1', lower='bh3', index=inc_index)
     bh2_pzm_dept, bh3_pzm_dept = sensor_depths_evol(
-        bh2_pzm_dept, bh3_pzm_dept, upper='bh2', lower='bh3')
+        bh2_pzm_dept, bh3_pzm_dept, upper='bh2', lower='bh3', index=pzm_index)
     bh2_thr_dept, bh3_thr_dept = sensor_depths_evol(
-        bh2_thr_dept, bh3_thr_dept, upper='bh2', lower='bh3')
+        bh2_thr_dept, bh3_thr_dept, upper='bh2', lower='bh3', index=thr_index)
 
-    # export to csv, force header on time series
+    # export depths to netcdf, other data to csv with headers on series
     # FIXME: base depths should be independent of instrument type
-    bh1_inc_base.to_csv('processed/bowdoin.bh1.inc.base.csv', header=True)
-    bh3_inc_base.to_csv('processed/bowdoin.bh3.inc.base.csv', header=True)
-    bh1_inc_dept.to_csv('processed/bowdoin.bh1.inc.dept.csv')
-    bh3_inc_dept.to_csv('processed/bowdoin.bh3.inc.dept.csv')
+    write_netcdf(bh1_inc_base, 'processed/bowdoin.bh1.inc.base.nc')
+    write_netcdf(bh3_inc_base, 'processed/bowdoin.bh3.inc.base.nc')
+    write_netcdf(bh1_inc_dept, 'processed/bowdoin.bh1.inc.dept.nc')
+    write_netcdf(bh3_inc_dept, 'processed/bowdoin.bh3.inc.dept.nc')
     bh1_inc.temp.to_csv('processed/bowdoin.bh1.inc.temp.csv')
     bh3_inc.temp.to_csv('processed/bowdoin.bh3.inc.temp.csv')
     bh1_inc.tilx.to_csv('processed/bowdoin.bh1.inc.tilx.csv')
@@ -614,18 +764,18 @@ def main():
     bh3_inc.tily.to_csv('processed/bowdoin.bh3.inc.tily.csv')
     bh1_inc.wlev.to_csv('processed/bowdoin.bh1.inc.wlev.csv')
     bh3_inc.wlev.to_csv('processed/bowdoin.bh3.inc.wlev.csv')
-    bh2_pzm_base.to_csv('processed/bowdoin.bh2.pzm.base.csv', header=True)
-    bh3_pzm_base.to_csv('processed/bowdoin.bh3.pzm.base.csv', header=True)
-    bh2_pzm_dept.to_csv('processed/bowdoin.bh2.pzm.dept.csv')
-    bh3_pzm_dept.to_csv('processed/bowdoin.bh3.pzm.dept.csv')
+    write_netcdf(bh2_pzm_base, 'processed/bowdoin.bh2.pzm.base.nc')
+    write_netcdf(bh3_pzm_base, 'processed/bowdoin.bh3.pzm.base.nc')
+    write_netcdf(bh2_pzm_dept, 'processed/bowdoin.bh2.pzm.dept.nc')
+    write_netcdf(bh3_pzm_dept, 'processed/bowdoin.bh3.pzm.dept.nc')
     bh2_pzm_temp.to_csv('processed/bowdoin.bh2.pzm.temp.csv', header=True)
     bh3_pzm_temp.to_csv('processed/bowdoin.bh3.pzm.temp.csv', header=True)
     bh2_pzm_wlev.to_csv('processed/bowdoin.bh2.pzm.wlev.csv', header=True)
     bh3_pzm_wlev.to_csv('processed/bowdoin.bh3.pzm.wlev.csv', header=True)
-    bh2_thr_base.to_csv('processed/bowdoin.bh2.thr.base.csv', header=True)
-    bh3_thr_base.to_csv('processed/bowdoin.bh3.thr.base.csv', header=True)
-    bh2_thr_dept.to_csv('processed/bowdoin.bh2.thr.dept.csv')
-    bh3_thr_dept.to_csv('processed/bowdoin.bh3.thr.dept.csv')
+    write_netcdf(bh2_thr_base, 'processed/bowdoin.bh2.thr.base.nc')
+    write_netcdf(bh3_thr_base, 'processed/bowdoin.bh3.thr.base.nc')
+    write_netcdf(bh2_thr_dept, 'processed/bowdoin.bh2.thr.dept.nc')
+    write_netcdf(bh3_thr_dept, 'processed/bowdoin.bh3.thr.dept.nc')
     bh2_thr_manu.to_csv('processed/bowdoin.bh2.thr.manu.csv')
     bh3_thr_manu.to_csv('processed/bowdoin.bh3.thr.manu.csv')
     bh2_thr_mask.to_csv('processed/bowdoin.bh2.thr.mask.csv')
@@ -3,66 +3,121 @@
 # Creative Commons Attribution-ShareAlike 4.0 International License
 # (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
 
-"""Extract velocity time series at the boreholes location."""
+"""Assemble velocity pairs in a cube and extract borehole time series."""
 
+import concurrent.futures
+import functools
 import os
 import zipfile
 import numpy as np
 import pandas as pd
 import netCDF4 as nc4
 import pyproj
+import xarray as xr
 
-# extract archive
-with zipfile.ZipFile('satellite/bowdoin-landsat-uv.zip') as archive:
-    namelist = archive.namelist()
-    archive.extractall('satellite')
-
-# GPS coordinates on 2015/07/01 00:00
-# FIXME: it looks like the point is slightly misplaced
-trans = pyproj.Transformer.from_crs('+proj=lonlat', '+proj=utm +zone=19')
-xb, yb = trans.transform(-68.560813961, 77.688492104)
-
-# initialize data dictionary
-dd = []
-
-# open data directory
-datadir = 'satellite/bowdoin-landsat-uv'
-namelist = sorted(os.listdir(datadir))
-ulist = [name for name in namelist if name.endswith('u.nc')]
-vlist = [name for name in namelist if name.endswith('v.nc')]
-for ufile, vfile in zip(ulist, vlist):
-
-    # make sure file names match
-    assert ufile.rstrip('u.nc') == vfile.rstrip('v.nc')
-
-    # read velocity data
-    upath = os.path.join(datadir, ufile)
-    vpath = os.path.join(datadir, vfile)
-    unc = nc4.Dataset(upath)
-    vnc = nc4.Dataset(vpath)
-    x = unc['x'][:]
-    y = unc['y'][:]
-    u = unc['z'][:]
-    v = vnc['z'][:]
-    unc.close()
-    vnc.close()
-    c = (u**2+v**2)**0.5
-
-    # count
-    print((c>0).count(), ufile)
+
+def read_pair(datadir, basename):
+    """Read u and v velocity components of one pair as a dataset."""
+    data = {}
+    for var in ('u', 'v'):
+        path = os.path.join(datadir, '{}_{}.nc'.format(basename, var))
+        with nc4.Dataset(path) as ds:
+            x = ds['x'][:].data
+            y = ds['y'][:].data
+            data[var] = (('y', 'x'), ds['z'][:].astype('f4').filled(np.nan))
+    return xr.Dataset(data, coords={'x': x, 'y': y})
+
+
+def parse_pair_name(basename):
+    """Return start and end dates from a ddmmyyyy_ddmmyyyy_... file name."""
+    start = pd.to_datetime(basename[0:8], format='%d%m%Y')
+    end = pd.to_datetime(basename[9:17], format='%d%m%Y')
+    return start, end
+
+
+def assemble_cube(datadir, workers=None):
+    """
+    Read all velocity pairs concurrently into a (pair, y, x) cube on the
+    grid of the first pair. Other pair grids are reindexed to the nearest
+    cell within half a cell, and filled with missing values elsewhere.
+    """
+
+    # list pair base names and make sure both components are there
+    namelist = sorted(os.listdir(datadir))
+    basenames = [name[:-5] for name in namelist if name.endswith('_u.nc')]
+    assert all(name+'_v.nc' in namelist for name in basenames)
+
+    # read pairs in separate processes as netCDF-C is not thread-safe
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        pairs = list(executor.map(
+            functools.partial(read_pair, datadir), basenames))
+
+    # reindex pairs to the reference grid of the first pair
+    ref = pairs[0]
+    tolerance = min(np.abs(np.diff(ref.x)).min(),
+                    np.abs(np.diff(ref.y)).min()) / 2
+    pairs = [pair.reindex(x=ref.x, y=ref.y, method='nearest',
+                          tolerance=tolerance) for pair in pairs]
+
+    # concatenate on the common grid with dates as coordinates
+    ds = xr.concat(pairs, dim='pair', join='exact')
+    start, end = zip(*map(parse_pair_name, basenames))
+    ds = ds.assign_coords(
+        pair=basenames, start=('pair', list(start)), end=('pair', list(end)))
+    ds = ds.assign_coords(baseline=ds.end-ds.start)
+    ds.u.attrs.update(long_name='velocity x-component', units='m a-1')
+    ds.v.attrs.update(long_name='velocity y-component', units='m a-1')
+    return ds
+
+
+def write_cube(ds, filename, chunks=(8, 128, 128)):
+    """Write velocity cube to a chunked and compressed netCDF file."""
+    chunks = tuple(min(c, n) for c, n in zip(chunks, ds.u.shape))
+    encoding = {var: dict(zlib=True, complevel=4, chunksizes=chunks)
+                for var in ('u', 'v')}
+    ds.to_netcdf(filename, encoding=encoding)
+
+
+def extract_series(ds, xb, yb):
+    """Extract speed and its 3x3 neighbourhood deviation at a point."""
 
     # find index of borehole location
-    i = np.argmin(np.abs(x-xb))
-    j = np.argmin(np.abs(y-yb))
-
-    # append to dict if non masked
-    if not c.mask[j, i]:
-        start = ufile[4:8] + ufile[2:4] + ufile[0:2]
-        end = ufile[13:17] + ufile[11:13] + ufile[9:11]
-        vel = c[j, i]
-        err = c[j-1:j+2, i-1:i+2].std()
-        dd.append(dict(start=start, end=end, vel=vel, err=err))
-
-# write to csv file
-df = pd.DataFrame(dd, columns=['start', 'end', 'vel', 'err'])
-df.to_csv('satellite/bowdoin-landsat-uv.csv', index=False, header=True)
+    i = np.argmin(np.abs(ds.x.values-xb))
+    j = np.argmin(np.abs(ds.y.values-yb))
+
+    # compute speed in a 3x3 window around all pairs at once
+    window = ds.isel(x=slice(i-1, i+2), y=slice(j-1, j+2))
+    speed = (window.u**2+window.v**2)**0.5
+
+    # keep non-masked values
+    df = pd.DataFrame(dict(
+        start=ds.start.dt.strftime('%Y%m%d').values,
+        end=ds.end.dt.strftime('%Y%m%d').values,
+        vel=speed.isel(x=1, y=1).values,
+        err=speed.std(dim=('x', 'y')).values))
+    return df[df.vel.notna()]
+
+
+def main():
+    """Main program called during execution."""
+
+    # extract archive
+    with zipfile.ZipFile('satellite/bowdoin-landsat-uv.zip') as archive:
+        archive.extractall('satellite')
+
+    # assemble and write velocity cube
+    ds = assemble_cube('satellite/bowdoin-landsat-uv')
+    write_cube(ds, 'satellite/bowdoin-landsat-uv.nc')
+
+    # GPS coordinates on 2015/07/01 00:00
+    # FIXME: it looks like the point is slightly misplaced
+    trans = pyproj.Transformer.from_crs('+proj=lonlat', '+proj=utm +zone=19')
+    xb, yb = trans.transform(-68.560813961, 77.688492104)
+
+    # write time series to csv file
+    df = extract_series(ds, xb, yb)
+    df.to_csv('satellite/bowdoin-landsat-uv.csv', index=False, header=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python
+# Copyright (c) 2016-2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""Retrieve external data concurrently with resume and a checksum manifest."""
+
+import argparse
+import concurrent.futures
+import functools
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import tarfile
+import threading
+import urllib.error
+import urllib.request
+
+
+# Global data
+# -----------
+
+# Arctic v3.0 DEM crop on Bowdoin (strips selected in arcticdem-strips.txt,
+# shared with the figure scripts; for transformation to UTM 19 coordinates use
+# ARCTICDEM_CRS = 'EPSG:32619' and ARCTICDEM_WINDOW = 500e3, 8615e3, 520e3,
+# 8630e3). Strips are cropped on ingestion, and need to be deleted for changes
+# in the project window, projection or resolution to take effect.
+ARCTICDEM_CRS = 'EPSG:3413'
+ARCTICDEM_RESOLUTION = 2
+ARCTICDEM_WINDOW = -537500, -1229000, -532500, -1224000  # w, s, e, n
+ARCTICDEM_ROOT = (
+    'https://data.pgc.umn.edu/elev/dem/setsm/ArcticDEM/strips/latest/2m/'
+    'n77w069')
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       'arcticdem-strips.txt'), encoding='utf-8') as _file:
+    ARCTICDEM_STRIPS = ['SETSM_s2s041_'+name for line in _file
+                        if (name := line.split('#')[0].strip())]
+
+# Intergovernmental Oceanographic Commission (IOC) Pituffik tide data
+IOC_ROOT = 'http://www.ioc-sealevelmonitoring.org/bgraph.php'
+IOC_MONTHS = [(year, month) for year in range(2014, 2018)
+              for month in range(1, 13) if (2014, 7) <= (year, month)
+              <= (2017, 7)]
+
+# SIGMA-B automatic weather station data
+SIGMA_ROOT = (
+    'https://mri-2.mri-jma.go.jp/owncloud/index.php/s/'
+    '60a7ce6376755287e4ec6a7eb4d5a839/download?path=%2F&files=')
+SIGMA_YEARS = range(2014, 2018)
+
+# transfer chunk size in bytes
+CHUNKSIZE = 2**20
+
+
+# Checksum manifest
+# -----------------
+
+class Manifest():
+    """
+    Thread-safe record of completed files with their size, modification time
+    and SHA-256 checksum, stored as JSON. Files recorded with unchanged size
+    and modification time are considered complete without reading them.
+    """
+
+    def __init__(self, filename):
+        """Load manifest from file if it exists."""
+        self.filename = filename
+        self.lock = threading.Lock()
+        self.entries = {}
+        if os.path.isfile(filename):
+            with open(filename, encoding='utf-8') as file:
+                self.entries = json.load(file)
+
+    def __contains__(self, name):
+        """Return True if a file is recorded and unchanged on disk."""
+        entry = self.entries.get(name)
+        if entry is None or not os.path.isfile(name):
+            return False
+        stat = os.stat(name)
+        return (stat.st_size, stat.st_mtime) == (
+            entry['size'], entry['mtime'])
+
+    def add(self, name):
+        """Checksum a completed file and record it in the manifest."""
+        stat = os.stat(name)
+        entry = {'size': stat.st_size, 'mtime': stat.st_mtime,
+                 'sha256': checksum(name)}
+        with self.lock:
+            self.entries[name] = entry
+            self.write()
+
+    def verify(self):
+        """Return names of recorded files whose checksum does not match."""
+        return [name for name, entry in sorted(self.entries.items())
+                if not os.path.isfile(name) or
+                checksum(name) != entry['sha256']]
+
+    def write(self):
+        """Write manifest atomically to avoid corruption on interruption."""
+        with open(self.filename+'.part', 'w', encoding='utf-8') as file:
+            json.dump(self.entries, file, indent=2, sort_keys=True)
+        os.replace(self.filename+'.part', self.filename)
+
+
+def checksum(filename):
+    """Return the SHA-256 hex digest of a local file."""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as file:
+        while chunk := file.read(CHUNKSIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Transfer methods
+# ----------------
+
+def open_url(url, start=0, timeout=60):
+    """Open a URL, requesting bytes from start onwards if nonzero."""
+    request = urllib.request.Request(url)
+    if start:
+        request.add_header('Range', f'bytes={start}-')
+    return urllib.request.urlopen(request, timeout=timeout)
+
+
+def open_resumed(url, part):
+    """
+    Open a URL from the end of a partial file using an HTTP range request.
+    Return the response and whether the server resumed the transfer, which
+    is not the case if it ignores ranges or if the partial file is stale.
+    """
+    start = os.path.getsize(part) if os.path.isfile(part) else 0
+    try:
+        response = open_url(url, start=start)
+    except urllib.error.HTTPError as error:
+        if error.code != 416:  # range not satisfiable, e.g. stale part
+            raise
+        start = 0
+        response = open_url(url)
+    return response, bool(start) and response.status == 206
+
+
+def download(url, dest):
+    """
+    Download a file, resuming from a partial .part file using an HTTP range
+    request if the server supports it, and restarting otherwise.
+    """
+    part = dest + '.part'
+    response, resumed = open_resumed(url, part)
+    with response, open(part, 'ab' if resumed else 'wb') as file:
+        shutil.copyfileobj(response, file, CHUNKSIZE)
+    os.replace(part, dest)
+
+
+class PartialReader():
+    """
+    Read-only file object over a partial download followed by the remaining
+    bytes of a response, which are appended to the partial file as they are
+    read, so that an interrupted transfer can be resumed.
+    """
+
+    def __init__(self, part, response, resumed=True):
+        """Open the partial file, truncating it unless resumed."""
+        self.file = open(  # pylint: disable=consider-using-with
+            part, 'a+b' if resumed else 'w+b')
+        self.file.seek(0)
+        self.response = response
+        self.local = resumed
+
+    def __enter__(self):
+        """Return the reader itself as context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Close the partial file."""
+        self.file.close()
+
+    def read(self, size=-1):
+        """Read local bytes first, then response bytes saved to file."""
+        if self.local:
+            data = self.file.read(size)
+            if data:
+                return data
+            self.local = False
+        data = self.response.read(size)
+        self.file.write(data)
+        return data
+
+
+def stream_member(url, member, dest):
+    """
+    Stream a gzipped tar archive from a URL and extract a single member,
+    without transferring the archive beyond that member. Bytes transferred
+    are kept in a partial archive, so that an interrupted transfer resumes
+    with a range request, until the member is extracted.
+    """
+    part = os.path.join(os.path.dirname(dest), os.path.basename(url)+'.part')
+    response, resumed = open_resumed(url, part)
+    with response, PartialReader(part, response, resumed) as reader, \
+            tarfile.open(fileobj=reader, mode='r|gz') as archive:
+        for info in archive:
+            if info.name == member:
+                with open(dest+'.part', 'wb') as file:
+                    shutil.copyfileobj(
+                        archive.extractfile(info), file, CHUNKSIZE)
+                break
+        else:
+            raise FileNotFoundError(f'{member} not found in {url}')
+    os.replace(dest+'.part', dest)
+    os.remove(part)
+
+
+# Dataset-specific methods
+# ------------------------
+
+def retrieve_arcticdem(strip, dest, root=ARCTICDEM_ROOT):
+    """
+    Stream an Arctic DEM strip archive with resume, extract its DEM and
+    warp it to the project window as a tiled, compressed float32 GeoTIFF
+    with nodata masked as NaN. The extracted DEM is deleted once cropped.
+    """
+    member = f'{strip}_dem.tif'
+    stream_member(f'{root}/{strip}.tar.gz', member, member)
+    subprocess.run([
+        'gdalwarp', '-q', '-overwrite', '-of', 'GTiff', '-r', 'cubic',
+        '-t_srs', ARCTICDEM_CRS, '-tr', *[str(ARCTICDEM_RESOLUTION)]*2,
+        '-te', *map(str, ARCTICDEM_WINDOW), '-ot', 'Float32',
+        '-srcnodata', '-9999', '-dstnodata', 'nan',
+        '-co', 'TILED=YES', '-co', 'COMPRESS=DEFLATE', '-co', 'PREDICTOR=3',
+        member, dest+'.part'], check=True)
+    os.replace(dest+'.part', dest)
+    os.remove(member)
+
+
+def retrieve_ioc_tide(year, month, dest, root=IOC_ROOT):
+    """Retrieve one month of IOC tide data and convert HTML table to CSV."""
+    endtime = f'{year+month//12}-{month % 12 + 1:02d}-01'
+    url = f'{root}?code=thul&output=tab&period=30&endtime={endtime}'
+    with open_url(url) as response:
+        text = response.read().decode('utf-8', errors='replace')
+    text = text.replace('</th>', '\n').replace('</td></tr>', '\n')
+    text = re.sub('<[^>\n]*>', '', text.replace('</td>', ','))
+    with open(dest+'.part', 'w', encoding='utf-8') as file:
+        file.write(text)
+    os.replace(dest+'.part', dest)
+
+
+def retrieve_sigma_aws(dest, root=SIGMA_ROOT):
+    """Retrieve SIGMA-B automatic weather station data for one year."""
+    download(root+dest, dest)
+
+
+def list_tasks(roots=None):
+    """
+    Return a dictionary of destination file names and retrieval functions
+    taking the destination as argument. Custom roots, e.g. a local HTTP
+    server, can be given as a dict with keys arcticdem, ioc and sigma.
+    """
+    roots = {'arcticdem': ARCTICDEM_ROOT, 'ioc': IOC_ROOT,
+             'sigma': SIGMA_ROOT, **(roots or {})}
+    tasks = {}
+    for strip in ARCTICDEM_STRIPS:
+        tasks[f'{strip}.tif'] = functools.partial(
+            retrieve_arcticdem, strip, root=roots['arcticdem'])
+    for year, month in IOC_MONTHS:
+        tasks[f'tide-thul-{year}{month:02d}.csv'] = functools.partial(
+            retrieve_ioc_tide, year, month, root=roots['ioc'])
+    for year in SIGMA_YEARS:
+        tasks[f'SIGMA_AWS_SiteB_{year}_level0_final.xls'] = (
+            functools.partial(retrieve_sigma_aws, root=roots['sigma']))
+    return tasks
+
+
+# Main program
+# ------------
+
+def retrieve(tasks, manifest, workers=4):
+    """
+    Run retrieval tasks missing from the manifest in a bounded thread pool.
+    Files already present from earlier runs are checksummed and recorded
+    without downloading them again. Return a dict of failed tasks.
+    """
+
+    # record existing files, skip complete ones
+    pending = {}
+    for dest, func in tasks.items():
+        if dest in manifest:
+            continue
+        if os.path.isfile(dest):
+            manifest.add(dest)
+        else:
+            pending[dest] = func
+
+    # run remaining tasks concurrently
+    errors = {}
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        futures = {executor.submit(func, dest): dest
+                   for dest, func in pending.items()}
+        for future in concurrent.futures.as_completed(futures):
+            dest = futures[future]
+            try:
+                future.result()
+                manifest.add(dest)
+                print(f'retrieved {dest}')
+            except Exception as error:  # pylint: disable=broad-except
+                errors[dest] = error
+                print(f'failed {dest}: {error}')
+    return errors
+
+
+def main():
+    """Main program called during execution."""
+
+    # parse arguments
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-w', '--workers', type=int, default=4,
+                        help='number of concurrent transfers')
+    parser.add_argument('--verify', action='store_true',
+                        help='re-checksum files recorded in the manifest')
+    args = parser.parse_args()
+
+    # make directory or update modification date
+    os.makedirs('external', exist_ok=True)
+    os.utime('external')
+    os.chdir('external')
+    manifest = Manifest('manifest.json')
+
+    # verify checksums locally if requested
+    if args.verify:
+        corrupt = manifest.verify()
+        for name in corrupt:
+            print(f'checksum mismatch {name}')
+        raise SystemExit(1 if corrupt else 0)
+
+    # retrieve missing files
+    errors = retrieve(list_tasks(), manifest, workers=args.workers)
+    raise SystemExit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""Test the external data fetcher against a local HTTP server stand-in."""
+
+import functools
+import http.server
+import importlib.util
+import io
+import os
+import tarfile
+import tempfile
+import threading
+import unittest
+
+# import retrieve-external.py from its path (its name is not a module name)
+_SPEC = importlib.util.spec_from_file_location(
+    'retrieve_external',
+    os.path.join(os.path.dirname(__file__), 'retrieve-external.py'))
+retrieve_external = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(retrieve_external)
+
+
+class RangeRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Serve files with support for open-ended byte range requests."""
+
+    def do_GET(self):
+        """Send a file from the requested byte onwards, and log requests."""
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path):
+            self.send_error(404)
+            return
+        with open(path, 'rb') as file:
+            data = file.read()
+        header = self.headers.get('Range')
+        self.server.requests.append((self.path, header))
+        start = int(header[len('bytes='):-1]) if header else 0
+        if start >= len(data) > 0:
+            self.send_error(416)
+            return
+        self.send_response(206 if header else 200)
+        self.send_header('Content-Length', str(len(data)-start))
+        self.end_headers()
+        try:
+            self.wfile.write(data[start:])
+        except ConnectionError:  # client stopped reading early
+            pass
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        """Do not log requests to stderr."""
+
+
+class TestRetrieveExternal(unittest.TestCase):
+    """Test resume, archive extraction and checksum manifest."""
+
+    def setUp(self):
+        """Serve a temporary directory on localhost and work in another."""
+        self.served = tempfile.TemporaryDirectory()
+        self.local = tempfile.TemporaryDirectory()
+        self.content = os.urandom(3*retrieve_external.CHUNKSIZE+123)
+        with open(self.served_path('data.xls'), 'wb') as file:
+            file.write(self.content)
+        self.server = http.server.ThreadingHTTPServer(
+            ('127.0.0.1', 0), functools.partial(
+                RangeRequestHandler, directory=self.served.name))
+        self.server.requests = []
+        self.root = f'http://127.0.0.1:{self.server.server_port}/'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        """Stop the server and remove temporary directories."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.served.cleanup()
+        self.local.cleanup()
+
+    def served_path(self, name):
+        """Return the path of a served file."""
+        return os.path.join(self.served.name, name)
+
+    def local_path(self, name):
+        """Return the path of a local file."""
+        return os.path.join(self.local.name, name)
+
+    def test_download_resumes_partial_file(self):
+        """Resume a partial download with a range request."""
+        dest = self.local_path('data.xls')
+        with open(dest+'.part', 'wb') as file:
+            file.write(self.content[:1000])
+        retrieve_external.download(self.root+'data.xls', dest)
+        with open(dest, 'rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertEqual(self.server.requests, [('/data.xls', 'bytes=1000-')])
+        self.assertFalse(os.path.exists(dest+'.part'))
+
+    def test_download_restarts_stale_partial_file(self):
+        """Restart a download if the partial file is too long."""
+        dest = self.local_path('data.xls')
+        with open(dest+'.part', 'wb') as file:
+            file.write(self.content+b'stale')
+        retrieve_external.download(self.root+'data.xls', dest)
+        with open(dest, 'rb') as file:
+            self.assertEqual(file.read(), self.content)
+
+    def write_archive(self):
+        """Write a served archive with a DEM between two other members."""
+        with tarfile.open(self.served_path('strip.tar.gz'), 'w:gz') as tar:
+            for name in ('strip_meta.txt', 'strip_dem.tif', 'strip_ortho.tif'):
+                info = tarfile.TarInfo(name)
+                info.size = len(self.content)
+                tar.addfile(info, io.BytesIO(self.content))
+        with open(self.served_path('strip.tar.gz'), 'rb') as file:
+            return file.read()
+
+    def test_stream_member_resumes_partial_archive(self):
+        """Resume an archive stream inside the member and extract it."""
+        head = self.write_archive()[:4*retrieve_external.CHUNKSIZE]
+        with open(self.local_path('strip.tar.gz.part'), 'wb') as file:
+            file.write(head)
+        member = self.local_path('strip_dem.tif')
+        retrieve_external.stream_member(
+            self.root+'strip.tar.gz', 'strip_dem.tif', member)
+        with open(member, 'rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertEqual(self.server.requests, [
+            ('/strip.tar.gz', f'bytes={len(head)}-')])
+        self.assertEqual(os.listdir(self.local.name), ['strip_dem.tif'])
+
+    def test_stream_member_restarts_stale_partial_archive(self):
+        """Restart an archive stream if the partial archive is too long."""
+        data = self.write_archive()
+        with open(self.local_path('strip.tar.gz.part'), 'wb') as file:
+            file.write(data+b'stale')
+        member = self.local_path('strip_dem.tif')
+        retrieve_external.stream_member(
+            self.root+'strip.tar.gz', 'strip_dem.tif', member)
+        with open(member, 'rb') as file:
+            self.assertEqual(file.read(), self.content)
+        self.assertEqual(os.listdir(self.local.name), ['strip_dem.tif'])
+
+    def test_manifest_skips_complete_and_detects_corrupt_files(self):
+        """Record checksums, skip complete files and detect corruption."""
+        dest = self.local_path('data.xls')
+        manifest = retrieve_external.Manifest(self.local_path('manifest.json'))
+        tasks = {dest: functools.partial(
+            retrieve_external.download, self.root+'data.xls')}
+
+        # first run downloads and records checksum
+        self.assertEqual(retrieve_external.retrieve(tasks, manifest), {})
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn(dest, manifest)
+        self.assertEqual(manifest.verify(), [])
+
+        # second run, with a reloaded manifest, sends no request
+        manifest = retrieve_external.Manifest(self.local_path('manifest.json'))
+        self.assertEqual(retrieve_external.retrieve(tasks, manifest), {})
+        self.assertEqual(len(self.server.requests), 1)
+
+        # same-size corruption is caught by checksum verification
+        with open(dest, 'r+b') as file:
+            file.write(b'\0')
+        self.assertEqual(manifest.verify(), [dest])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""
+Bowdoin warm data daemon. Load processed data once and serve it to figure
+scripts as Arrow IPC files memory-mapped from a temporary directory.
+
+Run ``python bowdata.py &`` in the figures directory before iterating on
+figures. Loading functions decorated with ``served`` then ask the daemon
+for their results over a Unix socket, and fall back to direct loading if
+the daemon is absent or if pyarrow is not installed.
+"""
+
+import argparse
+import collections
+import functools
+import glob
+import hashlib
+import importlib
+import json
+import os
+import socket
+import signal
+import socketserver
+import sys
+import tempfile
+import threading
+
+# Global parameters
+# -----------------
+
+SOCKET = os.path.join(tempfile.gettempdir(), f'bowdata-{os.getuid()}.sock')
+MODULES = ['bowtem_utils', 'bowstr_utils', 'bowdef_utils']
+REGISTRY = {}
+_SERVING = False
+
+
+# Client methods
+# --------------
+
+def served(func):
+    """Decorate a loading function to fetch its results from the daemon."""
+    name = f'{func.__module__}.{func.__name__}'
+    REGISTRY[name] = func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _SERVING and os.path.exists(SOCKET):
+            try:
+                return request(name, *args, **kwargs)
+            except Exception:  # pylint: disable=broad-except
+                pass
+        return func(*args, **kwargs)
+    return wrapper
+
+
+def request(name, *args, **kwargs):
+    """Request a function call result from the daemon."""
+    import pyarrow as pa  # pylint: disable=import-outside-toplevel
+
+    # send request and read reply
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(SOCKET)
+        sock.sendall(json.dumps(
+            {'name': name, 'args': args, 'kwargs': kwargs}).encode()+b'\n')
+        with sock.makefile('rb') as reader:
+            reply = json.loads(reader.readline())
+    if 'error' in reply:
+        raise RuntimeError(reply['error'])
+
+    # memory-map arrow files and convert to pandas
+    items = []
+    for item in reply['items']:
+        if 'path' in item:
+            with pa.memory_map(item['path']) as source:
+                data = pa.ipc.open_file(source).read_all().to_pandas(
+                    coerce_temporal_nanoseconds=True)
+            if item['kind'] != 'frame':
+                data = data.iloc[:, 0]
+            if item['kind'] == 'unnamed':
+                data.name = None
+            if item['freq'] is not None:
+                data.index.freq = item['freq']
+            item = data
+        else:
+            item = item['value']
+        items.append(item)
+    return tuple(items) if reply['tuple'] else items[0]
+
+
+# Server methods
+# --------------
+
+class ResultCache():
+    """Least-recently-used cache of results written as Arrow IPC files."""
+
+    def __init__(self, dirname, maxsize=64):
+        """Initialize with a directory for arrow files and a maximum size."""
+        self.dirname = dirname
+        self.maxsize = maxsize
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def __call__(self, name, args, kwargs):
+        """Return cached reply items, computing them if needed."""
+        key = hashlib.sha1(json.dumps(
+            [name, args, kwargs, data_version()], sort_keys=True).encode()
+            ).hexdigest()
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                return self.entries[key]
+            result = REGISTRY[name](*args, **kwargs)
+            reply = self.write(key, result)
+            self.entries[key] = reply
+            while len(self.entries) > self.maxsize:
+                _, evicted = self.entries.popitem(last=False)
+                for item in evicted['items']:
+                    if 'path' in item:
+                        os.remove(item['path'])
+            return reply
+
+    def write(self, key, result):
+        """Write dataframes and series to arrow files and return reply."""
+        import pandas as pd  # pylint: disable=import-outside-toplevel
+        import pyarrow as pa  # pylint: disable=import-outside-toplevel
+        reply = {'tuple': isinstance(result, tuple), 'items': []}
+        for i, item in enumerate(result if reply['tuple'] else [result]):
+            if isinstance(item, pd.Series):
+                kind = 'unnamed' if item.name is None else 'series'
+                item = item.to_frame()
+            elif isinstance(item, pd.DataFrame):
+                kind = 'frame'
+            else:
+                item = item.item() if hasattr(item, 'item') else item
+                reply['items'].append({'value': item})
+                continue
+            path = os.path.join(self.dirname, f'{key}.{i}.arrow')
+            table = pa.Table.from_pandas(item)
+            with pa.OSFile(path, 'wb') as sink, \
+                    pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            reply['items'].append({
+                'path': path, 'kind': kind,
+                'freq': getattr(item.index, 'freqstr', None)})
+        return reply
+
+
+def data_version():
+    """Return latest modification time of processed and external data."""
+    return max(
+        (os.path.getmtime(path) for path in glob.glob('../data/*/*.*')),
+        default=0)
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one JSON request line and reply with a JSON line."""
+
+    def handle(self):
+        """Compute or look up result and send reply."""
+        request_ = json.loads(self.rfile.readline())
+        try:
+            reply = self.server.cache(
+                request_['name'], request_['args'], request_['kwargs'])
+        except Exception as error:  # pylint: disable=broad-except
+            reply = {'error': f'{type(error).__name__}: {error}'}
+        self.wfile.write(json.dumps(reply).encode()+b'\n')
+
+
+def serve(maxsize=64):
+    """Import served modules and serve requests until interrupted."""
+    global _SERVING  # pylint: disable=global-statement
+    _SERVING = True
+
+    # import modules registering served functions
+    for module in MODULES:
+        try:
+            importlib.import_module(module)
+        except ImportError as error:
+            print(f'skipping {module}: {error}')
+
+    # clean up on termination as well as on interruption
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit())
+
+    # write arrow files to memory if possible
+    tmpdir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    with tempfile.TemporaryDirectory(prefix='bowdata-', dir=tmpdir) as dirname:
+        if os.path.exists(SOCKET):
+            os.remove(SOCKET)
+        with socketserver.ThreadingUnixStreamServer(
+                SOCKET, RequestHandler) as server:
+            server.cache = ResultCache(dirname, maxsize=maxsize)
+            print(f'serving {", ".join(sorted(REGISTRY))} on {SOCKET}')
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                os.remove(SOCKET)
+
+
+def main():
+    """Main program called during execution."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-m', '--maxsize', type=int, default=64,
+                        help='maximum number of cached results')
+    args = parser.parse_args()
+
+    # serve from the imported module, whose registry is shared with the utils
+    importlib.import_module('bowdata').serve(maxsize=args.maxsize)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,6 @@
 #!/usr/bin/env python2
 
 import matplotlib.pyplot as plt
-import netCDF4 as nc4
 import bowdef_utils
 
 if __name__ == '__main__':
@@ -10,17 +9,8 @@ if __name__ == '__main__':
     fig, ax = plt.subplots()
 
     # plot histogram
-    basename = '16072015_17082015_161111_1117_f'
-    upath = '../data/satellite/bowdoin-landsat-uv/%s_u.nc' % basename
-    vpath = '../data/satellite/bowdoin-landsat-uv/%s_v.nc' % basename
-    unc = nc4.Dataset(upath)
-    vnc = nc4.Dataset(vpath)
-    u = unc['z'][:]
-    v = vnc['z'][:]
-    unc.close()
-    vnc.close()
-    c = (u**2+v**2)**0.5
-    ax.hist(c.compressed(), bins=range(0,451,1), ec='none', fc=bowdef_utils.palette['darkorange'])
+    c = bowdef_utils.load_landsat_speed('16072015_17082015_161111_1117_f')
+    ax.hist(c.to_series().dropna(), bins=range(0,451,1), ec='none', fc=bowdef_utils.palette['darkorange'])
 
     # save
     bowdef_utils.savefig(fig)
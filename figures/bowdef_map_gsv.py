@@ -46,7 +46,9 @@ if __name__ == '__main__':
     for ax, reg in zip(grid, regions):
         ax.set_rasterization_zorder(2.5)
         ax.set_extent(reg, crs=ax.projection)
-        data, extent = bowdef_utils.open_gtif(filename, extent=reg)
+        res = (reg[1]-reg[0]) / ax.bbox.width  # map units per pixel
+        data, extent = bowdef_utils.open_gtif(
+            filename, extent=reg, resolution=res)
         im = ax.imshow(data, extent=extent, cmap='Blues', norm=norm)
 
     # add coastlines
@@ -3,7 +3,6 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import cartopy.crs as ccrs
-import netCDF4 as nc4
 import bowdef_utils
 import gpxpy
 
@@ -26,25 +25,17 @@ if __name__ == '__main__':
     ax.set_rasterization_zorder(2.5)
     ax.set_extent(extent, crs=utm)
 
-    # plot image data
-    filename = '../data/native/S2A_20160808_175915_456_RGB.jpg'
-    data, extent = bowdef_utils.open_gtif(filename)
+    # plot image data at the axes resolution from overviews
+    filename = '../data/processed/20160808_175915_456_S2A_RGB.tif'
+    w, e, s, n = ax.get_extent(crs=utm)
+    data, extent = bowdef_utils.open_gtif(
+        filename, extent=(w, e, s, n), resolution=(e-w)/ax.bbox.width)
     data = np.moveaxis(data, 0, 2)
     ax.imshow(data, extent=extent, transform=utm, cmap='Blues')
 
     # plot image data
-    basename = '16072015_17082015_161111_1117_f'
-    upath = '../data/satellite/bowdoin-landsat-uv/%s_u.nc' % basename
-    vpath = '../data/satellite/bowdoin-landsat-uv/%s_v.nc' % basename
-    unc = nc4.Dataset(upath)
-    vnc = nc4.Dataset(vpath)
-    x = unc['x'][:]
-    y = unc['y'][:]
-    u = unc['z'][:]
-    v = vnc['z'][:]
-    unc.close()
-    vnc.close()
-    c = (u**2+v**2)**0.5
+    c = bowdef_utils.load_landsat_speed('16072015_17082015_161111_1117_f')
+    x, y = c.x, c.y
     levs = range(0, 451, 50)
     cs = ax.contourf(x, y, c, levels=levs, extent=extent, transform=utm,
                      vmin=0.0, vmax=450.0, cmap='Reds', alpha=0.75)
@@ -10,30 +10,19 @@ import absplots as apl
 import matplotlib as mpl
 import numpy as np
 
+import bowdef_utils
 import bowstr_utils
 
 
-def compute_power_fit(depth, strain):
-    """Fit to a power law strain = constant * depth ** exponent."""
-    exponent, constant = np.polyfit(np.log(depth), np.log(strain), 1)
-    return exponent, np.exp(constant)
-
-
-def compute_shear_profile(base, depth, exponent, constant):
-    """Compute horizontal shear profile from fitted exponent and constant."""
-    power = exponent + 1
-    shear = 2 * constant / power * (base**power - depth**power)
-    return shear
-
-
 def plot_shear_profile(ax, base, depth, strain, color='tab:blue'):
     """Fit and plot tilt velocity profile."""
 
     # compute and plot discrete and extrapolated shear profiles
-    exponent, constant = compute_power_fit(depth, strain)
+    exponent, constant = bowdef_utils.glenfit(depth, strain.to_frame().T)
+    exponent, constant = exponent.iloc[0], constant.iloc[0]
     depth_int = np.linspace(0, base, 51)
-    shear_int = compute_shear_profile(base, depth_int, exponent, constant)
-    shear = compute_shear_profile(base, depth, exponent, constant)
+    shear_int = bowdef_utils.vsia(depth_int, base, exponent, constant)
+    shear = bowdef_utils.vsia(depth, base, exponent, constant)
     plot_shear_profile_lines(ax, base, depth_int, shear_int, color=color)
     plot_shear_profile_markers(ax, depth, shear, strain, color=color)
 
@@ -23,17 +23,13 @@ depth = bowdef_utils.load_depth('tiltunit', bh).squeeze()
 depth_base = bowdef_utils.load_depth('pressure', bh).squeeze()
 
 # ignore two lowest units on upper borehole
-if bh == 'upper':
-    broken = ['UI01', 'UI02', 'UI03']
-    depth.drop(broken, inplace=True)
-    exz.drop(broken, axis='columns', inplace=True)
+broken = ['UI01', 'UI02', 'UI03'] if bh == 'upper' else None
 
 # fit to a Glen's law
-n, A = bowdef_utils.glenfit(depth, exz.T)
+n, A = bowdef_utils.glenfit(depth, exz, broken=broken)
 
 # calc deformation velocity
 vdef = bowdef_utils.vsia(0.0, depth_base, n, A)
-vdef = pd.Series(index=exz.index, data=vdef)
 time = vdef.index.values
 vals = vdef.values
 
@@ -30,6 +30,7 @@ def main():
     tily = tily[tily.index >= '2014-07-17']
     tilt = np.arccos(np.cos(tilx)*np.cos(tily)) * 180 / np.pi
     tilt.plot(ax=ax, xlabel='', ylabel='tilt angle (°)')
+    bowtem_utils.decimate_lines(ax)
 
     # set axes properties
     ax.legend(loc='lower right', ncols=3)
@@ -1,7 +1,6 @@
 #!/usr/bin/env python2
 # coding: utf-8
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import bowdef_utils
 
@@ -24,15 +23,12 @@ for i, bh in enumerate(bowdef_utils.boreholes):
         broken = ['UI01', 'UI02', 'UI03']
     elif bh == 'lower':
         broken = ['LI01', 'LI02']
-    depth.drop(broken, inplace=True)
-    exz.drop(broken, axis='columns', inplace=True)
 
     # fit to a Glen's law
-    n, A = bowdef_utils.glenfit(depth, exz.T)
+    n, A = bowdef_utils.glenfit(depth, exz, broken=broken)
 
     # calc deformation velocity
     vdef = bowdef_utils.vsia(0.0, depth_base, n, A)
-    vdef = pd.Series(index=exz.index, data=vdef)
 
     # plot
     vdef.plot(ax=ax, c=c, label=bh)
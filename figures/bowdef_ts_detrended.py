@@ -2,56 +2,9 @@
 # coding: utf-8
 
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
 import bowdef_utils
 
-
-def seriesfit(ts, deg, imin=None, imax=None, **kwargs):
-    """Fit data series by a polynomial between imin and imax."""
-
-    # extract integer dates and data values
-    x = ts.index.astype(int)
-    y = ts.values
-
-    # exctact non-nan values over desired interval for polyfit
-    xclean = ts[imin:imax].dropna().index.astype(int)
-    yclean = ts[imin:imax].dropna().values
-
-    # perform polynomial fit
-    if len(xclean) != 0:
-        p = np.polyfit(xclean, yclean, deg, **kwargs)
-        v = np.polyval(p, x)
-        fit = pd.Series(index=ts.index, data=v)
-    else:
-        fit = ts.copy()
-
-    # return new series or empty series
-    return fit
-
-
-def framefit(df, deg, imin=None, imax=None, **kwargs):
-    """Fit each series in dataframe by a polynomial between imin and imax."""
-    fit = df.copy()
-    for col in fit.columns:
-        fit[col] = seriesfit(fit[col], deg, imin=imin, imax=imax, **kwargs)
-    return fit
-
-
-def detrend_series(ts, imin=None, imax=None):
-    """Detrend data series between imin and imax."""
-    trend = seriesfit(ts[imin:imax], 1, imin=None, imax=None)
-    ts -= trend
-    return ts
-
-
-def detrend_dataframe(df, imin=None, imax=None):
-    """Detrend each series in dataframe between imin and imax."""
-    trend = framefit(df, 1, imin=imin, imax=imax)
-    df -= trend
-    return df
-
-
 # reference dates
 d0 = '2014-11-01'
 d1 = '2015-11-01'
@@ -75,8 +28,8 @@ for i, bh in enumerate(bowdef_utils.boreholes):
     ty1 = tilty[d1].mean()
 
     # detrend
-    tiltx = detrend_dataframe(tiltx, imin=d0, imax=d1)
-    tilty = detrend_dataframe(tilty, imin=d0, imax=d1)
+    tiltx = bowdef_utils.detrend(tiltx, start=d0, end=d1)
+    tilty = bowdef_utils.detrend(tilty, start=d0, end=d1)
 
     # compute tilt relative to reference
     tilt = np.arcsin(np.sqrt(np.sin(tiltx)**2+np.sin(tilty)**2))*180/np.pi
@@ -10,29 +10,20 @@ fig, ax = bowdef_utils.subplots_mm(figsize=(135.0, 80.0),
                             left=10.0, right=2.5, bottom=10.0, top=2.5)
 
 # plot new sentinel velocity
-df = pd.read_csv('../data/satellite/bowdoin-sentinel.txt', delimiter=',\s+',
-                 index_col='YYYY-MM-DD (avg)', parse_dates=True,
-                 engine='python')
-dt = pd.to_timedelta(df['time-diff (days)'], unit='D')
-mid = df.index
-vel = df['vel (m/a)']
-err = df['vel_error (m/a)']
-mask = (dt <= pd.to_timedelta('12D'))
-ax.errorbar(mid[mask], vel[mask], xerr=dt[mask]/2, yerr=err[mask],
-            c=bowdef_utils.palette['lightpurple'], ls='', lw=0.5, zorder=4, alpha=0.75)
-ax.errorbar(mid[-mask], vel[-mask], xerr=dt[-mask]/2, yerr=err[-mask],
-            c=bowdef_utils.palette['darkpurple'], ls='', lw=0.5, zorder=4, alpha=0.75)
+df = bowdef_utils.query_velocity_catalog(sources=['sentinel'])
+mask = (df.baseline <= pd.to_timedelta('12D'))
+ax.errorbar(df.mid[mask], df.vel[mask], xerr=df.baseline[mask]/2,
+            yerr=df.err[mask], c=bowdef_utils.palette['lightpurple'], ls='',
+            lw=0.5, zorder=4, alpha=0.75)
+ax.errorbar(df.mid[~mask], df.vel[~mask], xerr=df.baseline[~mask]/2,
+            yerr=df.err[~mask], c=bowdef_utils.palette['darkpurple'], ls='',
+            lw=0.5, zorder=4, alpha=0.75)
 
 # plot landsat velocity
-df = pd.read_csv('../data/satellite/bowdoin-landsat-uv.csv',
-                 parse_dates=['start', 'end'])
-dt = df['end'] - df['start']
-mid = df['start'] + dt/2
-vel = df['vel']
-err = df['err']
-mid = pd.DatetimeIndex(mid)
-ax.errorbar(mid, vel, xerr=dt/2, yerr=err,
-            c=bowdef_utils.palette['darkorange'], lw=0.5, ls='', zorder=3, alpha=0.75)
+df = bowdef_utils.query_velocity_catalog(sources=['landsat-uv'])
+ax.errorbar(df.mid, df.vel, xerr=df.baseline/2, yerr=df.err,
+            c=bowdef_utils.palette['darkorange'], lw=0.5, ls='', zorder=3,
+            alpha=0.75)
 
 # plot deformation velocity
 for i, bh in enumerate(bowdef_utils.boreholes):
@@ -67,6 +58,16 @@ ts = bowdef_utils.load_data('dgps', 'velocity', 'upper')['vh'].resample('15min')
 ts.plot(ax=ax, c=c, ls='', marker='.', markersize=0.5, alpha=0.25)
 ts.resample('1D').mean().plot(ax=ax, c=c)
 
+# plot velocity inverted from landsat pairs at 2014 borehole waypoints
+pairs = bowdef_utils.query_velocity_catalog(
+    sources=['landsat-gpx'], locations=['B14BH1', 'B14BH2', 'B14BH3'])
+inv = bowdef_utils.invert_velocity(pairs)
+for name in inv.columns.unique(0):
+    c = bowdef_utils.COLOURS[name[3:].lower()]
+    ax.plot(inv.index, inv[name].vel, c=c, lw=0.5)
+    ax.fill_between(inv.index, inv[name].vel-inv[name].err,
+                    inv[name].vel+inv[name].err, color=c, alpha=0.25, lw=0)
+
 # add annotations
 kwa = {'fontweight': 'bold', 'ha': 'center', 'va': 'center'}
 ax.text('20150801', 600, 'GPS', color=bowdef_utils.colors['dgps'], **kwa)
@@ -7,10 +7,23 @@
 # FIXME this module is completely untested on recent Python versions and
 # contains code that duplicate bowtem_utils.py and other projects.
 
+import concurrent.futures
+import functools
+import itertools
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-from osgeo import gdal
+
+import bowdata
+import bowtem_utils
+import bowlazy
+
+# heavy modules imported on first use
+gdal = bowlazy.lazy_import('osgeo.gdal')
+sparse = bowlazy.lazy_import('scipy.sparse')
+splinalg = bowlazy.lazy_import('scipy.sparse.linalg')
+xr = bowlazy.lazy_import('xarray')
 
 # Global parameters
 # -----------------
@@ -19,6 +32,7 @@ g = 9.80665  # gravitational acceleration in m s-2
 COLOURS = {'bh1': 'C0', 'bh2': 'C1', 'bh3': 'C2', 'err': '0.75'}
 MARKERS = {'I': '^', 'P': 's', 'T': 'o'}
 DRILLING_DATES = {'bh1': '20140716', 'bh2': '20140717', 'bh3': '20140722'}
+VELOCITY_SOURCES = ('gps', 'landsat', 'landsat-gpx', 'landsat-uv', 'sentinel')
 
 
 # Data processing methods
@@ -38,6 +52,165 @@ def longest_continuous(ts):
     return ts
 
 
+# Glen's law fitting methods
+# --------------------------
+
+def glenfit(depth, strain, broken=None):
+    """
+    Fit strain profiles to a power law strain = constant * depth ** exponent
+    for all time steps at once, solving the log-linear least squares normal
+    equations over the entire (time, unit) array. Negative or zero strains
+    and depths, whose logarithms are undefined, are masked out of the fit.
+
+    Parameters
+    ----------
+    depth: series or dataframe
+        Sensor depths, either constant (unit) or time-dependent (time, unit).
+    strain: dataframe
+        Strain or strain rates with time as index and units as columns.
+    broken: list, optional
+        Names of broken units excluded from the fit.
+
+    Returns
+    -------
+    exponent: series
+        Fitted power-law exponent for each time step.
+    constant: series
+        Fitted power-law constant for each time step.
+    """
+
+    # align depths on strain columns (and index if time-dependent)
+    if isinstance(depth, pd.DataFrame):
+        depth = depth.reindex_like(strain, method='nearest')
+    else:
+        depth = depth.reindex(strain.columns)
+
+    # take logarithms, ignoring non-positive values
+    x = np.log(depth.where(depth > 0).to_numpy(dtype='float64'))
+    y = np.log(strain.where(strain > 0).to_numpy(dtype='float64'))
+    x, y = np.broadcast_arrays(x, y)
+
+    # mask missing data and broken units
+    valid = np.isfinite(x) & np.isfinite(y)
+    if broken is not None:
+        valid &= ~strain.columns.isin(broken)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+
+    # compute sums entering the normal equations
+    count = valid.sum(axis=1)
+    sumx = x.sum(axis=1)
+    sumy = y.sum(axis=1)
+    sumxx = (x*x).sum(axis=1)
+    sumxy = (x*y).sum(axis=1)
+
+    # solve for slope and intercept, need at least two distinct depths
+    with np.errstate(divide='ignore', invalid='ignore'):
+        det = count*sumxx - sumx**2
+        exponent = (count*sumxy - sumx*sumy) / det
+        intercept = (sumy - exponent*sumx) / count
+    invalid = (count < 2) | (det <= 0)
+    exponent[invalid] = np.nan
+    intercept[invalid] = np.nan
+
+    # return as time series
+    exponent = pd.Series(exponent, index=strain.index, name='exponent')
+    constant = pd.Series(np.exp(intercept), index=strain.index,
+                         name='constant')
+    return exponent, constant
+
+
+def vsia(depth, base, exponent, constant):
+    """
+    Integrate power-law strain from the base up to depth, returning the
+    horizontal shear velocity (or displacement for total strain). Exponent
+    and constant can be time series as returned by glenfit.
+    """
+    power = exponent + 1
+    return 2 * constant / power * (base**power - depth**power)
+
+
+# Trend fitting methods
+# ---------------------
+
+def trendfit(data, deg=1, start=None, end=None, robust=False, maxiter=10):
+    """
+    Fit polynomials to all columns of a dataframe between start and end,
+    using a shared Vandermonde matrix and a masked least squares solve.
+
+    Parameters
+    ----------
+    data: series or dataframe
+        Time series to fit, possibly containing missing values.
+    deg: integer
+        Degree of the fitting polynomials.
+    start, end: datetime-like, optional
+        Interval used for the fit, the trend is evaluated on the full index.
+    robust: bool
+        Use iteratively reweighted Huber regression to reduce the influence
+        of outliers.
+    maxiter: integer
+        Number of reweighting iterations in robust mode.
+
+    Returns
+    -------
+    trend: series or dataframe
+        Fitted polynomials evaluated on the data index, not-a-number for
+        columns with too few values for the requested degree.
+    """
+
+    # work on a dataframe
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    index = frame.index
+
+    # convert index to floats once and rescale to [-1, 1] over the interval
+    if isinstance(index, pd.DatetimeIndex):
+        x = ((index - index[0]) / pd.to_timedelta('1D')).to_numpy()
+    else:
+        x = index.to_numpy(dtype='float64')
+    inside = np.zeros(len(index), dtype='bool')
+    inside[index.slice_indexer(start, end)] = True
+    xmin, xmax = x[inside].min(), x[inside].max()
+    x = (2*x - xmin - xmax) / ((xmax - xmin) or 1.0)
+    vander = np.vander(x, deg+1)
+
+    # mask missing values and values outside the fit interval
+    y = frame.to_numpy(dtype='float64')
+    valid = np.isfinite(y) & inside[:, None]
+    y = np.where(valid, y, 0.0)
+    enough = valid.sum(axis=0) > deg
+    weights = valid * enough
+
+    # solve the weighted normal equations for all columns at once
+    def solve(weights):
+        gram = np.einsum('tc,ti,tj->cij', weights, vander, vander)
+        gram[~enough] = np.eye(deg+1)
+        moment = np.einsum('tc,ti,tc->ci', weights, vander, y)
+        return np.linalg.solve(gram, moment[..., None])[..., 0]
+    coefs = solve(weights)
+
+    # in robust mode, downweight residuals beyond 1.345 robust std (Huber)
+    for _ in range(maxiter if robust else 0):
+        resid = abs(y - vander @ coefs.T)
+        scale = 1.4826 * pd.DataFrame(resid).where(valid).median().to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = resid / (1.345 * scale)
+            weights = valid * enough * np.where(ratio > 1, 1/ratio, 1.0)
+        coefs = solve(weights)
+
+    # evaluate polynomials on the full index
+    trend = vander @ coefs.T
+    trend[:, ~enough] = np.nan
+    trend = pd.DataFrame(trend, index=index, columns=frame.columns)
+    return trend.squeeze('columns') if isinstance(data, pd.Series) else trend
+
+
+def detrend(data, deg=1, start=None, end=None, **kwargs):
+    """Remove polynomial trend fitted between start and end from all columns.
+    Additional keyword arguments are passed to trendfit."""
+    return data - trendfit(data, deg=deg, start=start, end=end, **kwargs)
+
+
 # Methods to load borehole data
 # -----------------------------
 
@@ -149,39 +322,384 @@ def load_temp_sigma(site='B'):
     return ts
 
 
+def read_gloss_hourly(filename):
+    """
+    Read GLOSS (UHSLC legacy format) hourly sea level file in a data series.
+
+    Data lines contain a station code and name, the date in columns 12-19
+    with blank-padded month and day, a half-day indicator 1 or 2 in column 20,
+    and twelve hourly values in mm in five-character fields from column 21.
+    Yearly header lines are detected and skipped automatically. Missing
+    values (9999) are dropped. Data lines shorter than the 80-character
+    record length raise a ValueError.
+    """
+
+    # read lines as a (line, character) byte array
+    with open(filename, 'rb') as fil:
+        lines = np.array(fil.read().splitlines())
+    chars = lines.view('u1').reshape(len(lines), -1)
+
+    # detect data lines from date, half-day indicator, and numeric values
+    digits = (chars >= ord('0')) & (chars <= ord('9'))
+    blanks = (chars == ord(' ')) | (chars == 0)
+    isdata = (
+        np.isin(chars[:, 19], (ord('1'), ord('2'))) &
+        (digits | blanks)[:, 11:19].all(axis=1) &
+        (digits | blanks | (chars == ord('-')))[:, 20:].all(axis=1))
+    chars = chars[isdata]
+
+    # make sure no data record is truncated
+    short = np.char.str_len(lines[isdata]) < 80
+    if short.any():
+        raise ValueError("Truncated GLOSS record at line %d of %s." % (
+            np.flatnonzero(isdata)[short][0]+1, filename))
+
+    # construct dates from digits, treating blanks as zeros
+    date = np.where(digits[isdata, 11:19], chars[:, 11:19] - ord('0'), 0)
+    date = date @ 10**np.arange(7, -1, -1)
+    date = pd.to_datetime(pd.DataFrame({
+        'year': date // 10000, 'month': date // 100 % 100, 'day': date % 100}))
+
+    # compute hourly times for each half-day
+    half = chars[:, 19] - ord('1')
+    start = date.to_numpy() + half * np.timedelta64(12, 'h')
+    times = start[:, None] + np.arange(12) * np.timedelta64(1, 'h')
+
+    # slice values at fixed five-character fields, which may touch
+    values = np.ascontiguousarray(chars[:, 20:80]).view('S5').astype(float)
+
+    # return as a data series without missing values
+    ts = pd.Series(values.ravel(), index=times.ravel())
+    ts = ts[ts != 9999]
+    return ts
+
+
 def load_tide_hour():
     """Load GLOSS hourly Pituffik tide data."""
 
-    # date parser
-    def parser(index):
-        date_str = index[11:-1].replace(' ', '0')
-        hour_str = {'1': '00', '2': '12'}[index[-1]]
-        return pd.datetime.strptime(date_str+hour_str, '%Y%m%d%H')
-
     # read data
-    skiprows = [0, 245, 976, 1709, 2440, 3171, 3902,
-                4635, 5366, 6097, 6828, 7561]
-    df = pd.read_fwf('../data/external/h808.dat', skiprows=skiprows,
-                     index_col=0, parse_dates=True, date_parser=parser,
-                     header=None, delimiter=' ', dtype=None, na_values='9999')
-
-    # stack and reindex
-    df = df.stack()
-    df.index = df.index.map(lambda x: x[0] + pd.to_timedelta(x[1]-1, unit='H'))
+    ts = read_gloss_hourly('../data/external/h808.dat')
 
     # convert to meter and remove mean
-    df = (df-df.mean())/1e3
+    ts = (ts-ts.mean())/1e3
+    return ts
+
+
+@functools.lru_cache
+def open_landsat_uv():
+    """
+    Open the Landsat velocity cube lazily. Pairs are indexed by file base
+    name, with start and end dates and baselines as coordinates.
+    """
+    return xr.open_dataset('../data/satellite/bowdoin-landsat-uv.nc')
+
+
+def load_landsat_speed(pair):
+    """Load Landsat ice speed for one velocity pair in m a-1."""
+    ds = open_landsat_uv().sel(pair=pair)
+    return (ds.u**2+ds.v**2)**0.5
+
+
+# Velocity catalog methods
+# ------------------------
+
+def load_gps_velocity(freq='1D'):
+    """
+    Load D-GPS horizontal velocity averages and standard errors in m a-1 as
+    intervals with start and end dates.
+    """
+    df = pd.read_csv('../data/processed/bowdoin.bh1.gps.csv', index_col=0,
+                     parse_dates=True)
+    stats = window_stats(df.vh, freq=freq, stats=('count', 'mean', 'std'))
+    df = pd.DataFrame({
+        'start': stats.index,
+        'end': stats.index + pd.to_timedelta(freq),
+        'vel': stats['mean'].to_numpy(),
+        'err': (stats['std'] / stats['count']**0.5).to_numpy()})
+    return df.dropna()
+
+
+def load_landsat_pairs(filename='../data/satellite/bowdoin-landsat.csv'):
+    """
+    Load Landsat image-pair velocities and errors in m a-1 at the borehole
+    location, with start and end dates of each pair. Errors are the standard
+    deviation of velocity over the 3x3 pixel neighbourhood.
+    """
+    df = pd.read_csv(filename, dtype={'start': str, 'end': str})
+    df['start'] = pd.to_datetime(df.start, format='%Y%m%d')
+    df['end'] = pd.to_datetime(df.end, format='%Y%m%d')
     return df
 
 
+def load_sentinel_pairs():
+    """
+    Load Sentinel-1 image-pair velocities and errors in m a-1 at the borehole
+    location, with start and end dates of each pair.
+    """
+    df = pd.read_csv('../data/satellite/bowdoin-sentinel.txt',
+                     skipinitialspace=True)
+    return pd.DataFrame({
+        'start': pd.to_datetime(df['YYYY-MM-DD (1st)']),
+        'end': pd.to_datetime(df['YYYY-MM-DD (2nd)']),
+        'vel': df['vel (m/a)'],
+        'err': df['vel_error (m/a)']})
+
+
+def sample_landsat_pairs(names=None, crs='+proj=utm +zone=19'):
+    """
+    Sample Landsat image-pair velocities and errors in m a-1 at named
+    waypoints from locations.gpx, using the cube from open_landsat_uv.
+    Waypoints default to all those inside the cube. Errors are the standard
+    deviation of speed over the 3x3 pixel neighbourhood of each waypoint, a
+    proxy for measurement error that vanishes over uniform flow.
+    """
+
+    # get waypoint coordinates and open velocity cube
+    points = bowtem_utils.load_waypoints().to_crs(crs)
+    if names is not None:
+        points = points.loc[list(names)]
+    ds = open_landsat_uv()
+
+    # extract speed in a 3x3 window around each point for all pairs
+    frames = []
+    for name, point in points.geometry.items():
+        i = np.argmin(np.abs(ds.x.values-point.x))
+        j = np.argmin(np.abs(ds.y.values-point.y))
+        if not (0 < i < ds.x.size-1 and 0 < j < ds.y.size-1):
+            continue
+        window = ds.isel(x=slice(i-1, i+2), y=slice(j-1, j+2))
+        speed = (window.u**2+window.v**2)**0.5
+        frames.append(pd.DataFrame({
+            'location': name, 'start': ds.start.values, 'end': ds.end.values,
+            'vel': speed.isel(x=1, y=1).values,
+            'err': speed.std(dim=('x', 'y')).values}))
+
+    # return non-masked values
+    df = pd.concat(frames, ignore_index=True)
+    return df.dropna(subset=['vel'])
+
+
+@functools.lru_cache
+def _load_velocity_source(source):
+    """Load velocities from a single catalog source once."""
+    loaders = {
+        'gps': load_gps_velocity,
+        'landsat': load_landsat_pairs,
+        'landsat-gpx': sample_landsat_pairs,
+        'landsat-uv': functools.partial(
+            load_landsat_pairs, '../data/satellite/bowdoin-landsat-uv.csv'),
+        'sentinel': load_sentinel_pairs}
+    if source not in loaders:
+        raise ValueError(f"Unknown velocity source {source}.")
+    df = loaders[source]()
+
+    # point products without a location were extracted near BH1
+    if 'location' not in df:
+        df = df.assign(location='bh1')
+    return df.assign(source=source)
+
+
+@functools.lru_cache
+def _build_velocity_catalog(sources):
+    """Concatenate, type and sort velocities from a tuple of sources."""
+
+    # concatenate selected sources, each loaded on first use
+    df = pd.concat([_load_velocity_source(source) for source in sources],
+                   ignore_index=True)
+
+    # add derived columns and set types
+    df = df.astype({
+        'start': 'datetime64[ns]', 'end': 'datetime64[ns]', 'vel': 'float64',
+        'err': 'float64', 'source': 'category', 'location': 'category'})
+    df['baseline'] = df.end - df.start
+    df['mid'] = df.start + df.baseline/2
+
+    # sort by start date and compute reach
+    df = df.sort_values(['start', 'end'], ignore_index=True)
+    df['reach'] = df.end.cummax()
+    columns = ['start', 'end', 'mid', 'baseline', 'vel', 'err', 'source',
+               'location', 'reach']
+    return df[columns]
+
+
+@bowdata.served
+def load_velocity_catalog(sources=None):
+    """
+    Load velocity products in a typed table sorted by start date, with
+    columns start, end, mid, baseline, vel, err, source and location. Only
+    the selected sources (all of VELOCITY_SOURCES by default) are read, each
+    once. The reach column holds the running maximum of end dates, which
+    makes the table a sorted interval index for query_velocity_catalog.
+    """
+    sources = VELOCITY_SOURCES if sources is None else sources
+    return _build_velocity_catalog(tuple(sorted(set(sources)))).copy()
+
+
+def query_velocity_catalog(start=None, end=None, min_baseline=None,
+                           max_baseline=None, sources=None, locations=None):
+    """
+    Return velocity catalog entries overlapping the [start, end) interval,
+    optionally filtered by baseline, source and location.
+
+    Parameters
+    ----------
+    start, end: date-like, optional
+        Query interval bounds, unbounded by default.
+    min_baseline, max_baseline: timedelta-like, optional
+        Inclusive bounds on the pair baseline.
+    sources: sequence, optional
+        Source names to load, all of VELOCITY_SOURCES by default.
+    locations: sequence, optional
+        Location names to keep, all by default.
+
+    Returns
+    -------
+    df: dataframe
+        Subset of the catalog, sorted by start date.
+    """
+
+    # narrow down candidates using the sorted start and reach columns
+    catalog = load_velocity_catalog(sources)
+    first, last = 0, len(catalog)
+    if start is not None:
+        start = pd.Timestamp(start)
+        first = catalog.reach.searchsorted(start, side='right')
+    if end is not None:
+        last = catalog.start.searchsorted(pd.Timestamp(end), side='left')
+    df = catalog.iloc[first:last]
+
+    # filter remaining entries
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= df.end > start
+    if min_baseline is not None:
+        mask &= df.baseline >= pd.to_timedelta(min_baseline)
+    if max_baseline is not None:
+        mask &= df.baseline <= pd.to_timedelta(max_baseline)
+    if locations is not None:
+        mask &= df.location.isin(locations)
+    return df[mask]
+
+
+# Velocity inversion methods
+# --------------------------
+
+def invert_velocity(pairs, start=None, end=None, freq='1D', smoothing=5.0,
+                    min_err=1.0):
+    """
+    Invert overlapping interval-averaged velocities into a regularized
+    velocity time series with uncertainties, using a sparse least-squares
+    solver.
+
+    Parameters
+    ----------
+    pairs: dataframe
+        Velocities averaged over intervals, with columns start, end, vel and
+        err in m a-1, and optionally location to invert several locations at
+        once.
+    start, end: date-like, optional
+        Inversion period, defaults to the span of all intervals.
+    freq: string
+        Time step of the inverted time series.
+    smoothing: scalar
+        Expected standard deviation of velocity second differences between
+        consecutive time steps in m a-1.
+    min_err: scalar
+        Lower bound applied to velocity errors in m a-1, which also keeps
+        Landsat neighbourhood deviations near zero from dominating the fit.
+
+    Returns
+    -------
+    inv: dataframe
+        Inverted velocity vel and approximate error err in m a-1 indexed by
+        the start of each time step, with an additional column level for
+        each location if pairs contain a location column. Errors are the
+        square root of the variance estimate returned by LSQR, which only
+        approximates the diagonal of the posterior covariance.
+    """
+
+    # factorize points and prepare time steps
+    pairs = pairs.dropna(subset=['start', 'end', 'vel', 'err'])
+    codes, points = pd.factorize(
+        pairs.get('location', pd.Series(0, pairs.index)), sort=True)
+    step = pd.to_timedelta(freq)
+    start = pd.Timestamp(start or pairs.start.min().floor(freq))
+    end = pd.Timestamp(end or pairs.end.max().ceil(freq))
+    index = pd.date_range(start, end, freq=freq, inclusive='left')
+    steps = len(index)
+    if steps < 2:
+        raise ValueError(
+            f"Inversion period {start} to {end} spans less than two "
+            f"{freq} time steps.")
+
+    # convert interval bounds to fractional time steps and drop empty ones
+    lower = ((pairs.start-start)/step).clip(0, steps).to_numpy()
+    upper = ((pairs.end-start)/step).clip(0, steps).to_numpy()
+    valid = upper > lower
+    lower, upper, codes = lower[valid], upper[valid], codes[valid]
+    vel = pairs.vel.to_numpy()[valid]
+    err = pairs.err.clip(lower=min_err).to_numpy()[valid]
+
+    # list overlapping time steps of each interval
+    first = np.floor(lower).astype(int)
+    count = np.ceil(upper).astype(int) - first
+    rows = np.repeat(np.arange(len(vel)), count)
+    cols = (np.arange(count.sum()) - np.repeat(np.cumsum(count)-count, count)
+            + first[rows])
+
+    # weight steps by their overlap fraction and inverse error
+    overlap = np.minimum(upper[rows], cols+1) - np.maximum(lower[rows], cols)
+    weights = overlap / (upper-lower)[rows] / err[rows]
+    design = sparse.csr_matrix(
+        (weights, (rows, cols+codes[rows]*steps)),
+        shape=(len(vel), steps*len(points)))
+
+    # add second-difference regularization for each point
+    regul = sparse.diags([1.0, -2.0, 1.0], [0, 1, 2], shape=(steps-2, steps))
+    regul = sparse.kron(sparse.eye(len(points)), regul/smoothing)
+    design = sparse.vstack([design, regul]).tocsr()
+    rhs = np.concatenate([vel/err, np.zeros(regul.shape[0])])
+
+    # solve sparse least-squares problem
+    result = splinalg.lsqr(design, rhs, atol=1e-12, btol=1e-12,
+                           iter_lim=10*design.shape[1], calc_var=True)
+    solution, var = result[0], result[-1]
+
+    # return as a dataframe
+    data = np.stack([solution, var**0.5], axis=-1)
+    data = data.reshape(len(points), steps, 2).swapaxes(0, 1)
+    inv = pd.DataFrame(
+        data.reshape(steps, -1), index=index,
+        columns=pd.MultiIndex.from_product([points, ['vel', 'err']]))
+    return inv if 'location' in pairs else inv[points[0]]
+
+
 # Methods to open geographic data
 # -------------------------------
 
-def open_gtif(filename, extent=None):
-    """Open GeoTIFF and return data and extent."""
+@functools.lru_cache(maxsize=8)
+def open_dataset(filename):
+    """Open GDAL dataset, keeping a few recently used handles open."""
+    return gdal.Open(filename)
+
+
+def open_gtif(filename, extent=None, resolution=None):
+    """
+    Open GeoTIFF and return data and extent.
+
+    Parameters
+    ----------
+    filename: string
+        Path of the GeoTIFF file to open.
+    extent: (w, e, s, n), optional
+        Map extent to read, defaults to the whole image.
+    resolution: scalar, optional
+        Target resolution in map units. If coarser than the native resolution,
+        data are read decimated, letting GDAL use any available overviews.
+    """
 
     # open dataset
-    ds = gdal.Open(filename)
+    ds = open_dataset(filename)
 
     # read geotransform
     x0, dx, dxdy, y0, dydx, dy = ds.GetGeoTransform()
@@ -224,11 +742,18 @@ def open_gtif(filename, extent=None):
     x1 = x0 + dx*cols
     y1 = y0 + dy*rows
 
+    # compute decimated buffer size for coarser target resolution
+    bufcols, bufrows = cols, rows
+    if resolution is not None and resolution > abs(dx):
+        bufcols = max(1, round(cols*abs(dx)/resolution))
+    if resolution is not None and resolution > abs(dy):
+        bufrows = max(1, round(rows*abs(dy)/resolution))
+
     # read image data
-    data = ds.ReadAsArray(col0, row0, cols, rows)
+    data = ds.ReadAsArray(
+        col0, row0, cols, rows, buf_xsize=bufcols, buf_ysize=bufrows)
 
-    # close dataset and return image data and extent
-    ds = None
+    # return image data and extent
     return data, (x0, x1, y0, y1)
 
 
@@ -268,19 +793,130 @@ def unframe(ax, edges=['bottom', 'left']):
 # Timeseries elements
 # -------------------
 
+def _window_bounds(index, window=None, freq=None):
+    """
+    Return start and end row bounds and labels of rolling windows ending at
+    each row, or of resampling bins, for a sorted index.
+    """
+    rows = np.arange(1, len(index)+1)
+    if freq is not None:
+        counts = pd.Series(1, index=index).resample(freq).count()
+        upper = np.cumsum(counts.to_numpy())
+        return upper-counts.to_numpy(), upper, counts.index
+    if isinstance(window, int):
+        return np.maximum(rows-window, 0), rows, index
+    lower = index.searchsorted(index-pd.to_timedelta(window), side='right')
+    return lower, rows, index
+
+
+def _range_reduce(func, values, lower, upper):
+    """
+    Reduce (row, column) values over [lower, upper) row ranges with an
+    idempotent function such as np.fmin, using a table of reductions over
+    power-of-two ranges built by doubling.
+    """
+    length = upper - lower
+    level = np.log2(np.maximum(length, 1)).astype(int)
+    tables = [values]
+    while 2**len(tables) <= length.max(initial=0):
+        step = 2**(len(tables)-1)
+        tables.append(func(tables[-1][:-step], tables[-1][step:]))
+    out = np.full((len(length), values.shape[1]), np.nan)
+    for k, table in enumerate(tables):
+        rows = (level == k) & (length > 0)
+        out[rows] = func(table[lower[rows]], table[upper[rows]-2**k])
+    return out
+
+
+def window_stats(data, window=None, freq=None, stats=('mean', 'std'),
+                 quantiles=()):
+    """
+    Compute rolling window or resampled statistics of a series or dataframe.
+    Counts, sums, means, variances and standard deviations of all columns
+    derive from a single cumulative pass over centred values, and minima
+    and maxima from a doubling table of range reductions. Quantiles are
+    computed by pandas in a separate pass each.
+
+    Parameters
+    ----------
+    data: series or dataframe
+        Time series to compute statistics from, with a sorted index.
+    window: integer or string, optional
+        Rolling window size, in number of samples or as a time offset such as
+        '1D' for irregular indexes. Windows of a number of samples require
+        that many valid values, as in pandas.
+    freq: string, optional
+        Resampling frequency, used instead of a rolling window.
+    stats: list
+        Names of aggregations among 'count', 'sum', 'mean', 'var', 'std',
+        'min' and 'max'.
+    quantiles: list
+        Quantiles to compute in addition to the above statistics.
+
+    Returns
+    -------
+    stats: dataframe
+        Statistics with names (and quantiles) as the outer column level.
+    """
+
+    # check argument validity
+    if (window is None) == (freq is None):
+        raise ValueError("Exactly one of window or freq must be given.")
+    unknown = set(stats) - {'count', 'sum', 'mean', 'var', 'std', 'min',
+                            'max'}
+    if unknown:
+        raise ValueError(f"Unknown statistics {sorted(unknown)}.")
+
+    # prepare (row, column) values and window bounds
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    values = frame.to_numpy(dtype=float)
+    lower, upper, index = _window_bounds(frame.index, window, freq)
+
+    # accumulate counts and centred moments in a single cumulative pass
+    valid = ~np.isnan(values)
+    centre = np.nanmean(np.where(valid.any(axis=0), values, 0.0), axis=0)
+    anomaly = np.where(valid, values-centre, 0.0)
+    cumsums = np.zeros((3, len(values)+1, values.shape[1]))
+    np.cumsum([valid, anomaly, anomaly**2], axis=1, out=cumsums[:, 1:])
+    count, total, square = cumsums[:, upper] - cumsums[:, lower]
+
+    # derive moments, masking windows with too few values
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(count > 0, total/count, np.nan)
+        var = np.where(count > 1, np.maximum(square-total*mean, 0.0) /
+                       (count-1), np.nan)
+    result = {'count': count, 'sum': total+centre*count, 'mean': mean+centre,
+              'var': var, 'std': var**0.5}
+    for name, func in (('min', np.fmin), ('max', np.fmax)):
+        if name in stats:
+            result[name] = _range_reduce(func, values, lower, upper)
+    if isinstance(window, int):
+        for name in set(result) - {'count'}:
+            result[name] = np.where(count < window, np.nan, result[name])
+
+    # convert to pandas objects and add quantiles
+    result = {name: pd.DataFrame(result[name], index=index,
+                                 columns=frame.columns) for name in stats}
+    if isinstance(data, pd.Series):
+        result = {name: df.iloc[:, 0].rename(data.name)
+                  for name, df in result.items()}
+    windows = data.rolling(window) if freq is None else data.resample(freq)
+    result.update({q: windows.quantile(q) for q in quantiles})
+    return pd.concat(result, axis=1)
+
+
 def resample_plot(ax, ts, freq, c='b'):
     """Plot resampled mean and std of a timeseries."""
-    avg = ts.resample(freq).mean()
-    std = ts.resample(freq).std()
+    stats = window_stats(ts, freq=freq)
+    avg, std = stats['mean'], stats['std']
     avg.plot(ax=ax, color=c, ls='-')
-    # for some reason not working
     ax.fill_between(avg.index, avg-2*std, avg+2*std, color=c, alpha=0.25)
 
 
 def rolling_plot(ax, ts, window, c='b'):
     """Plot rolling window mean and std of a timeseries."""
-    avg = pd.rolling_mean(ts, window)
-    std = pd.rolling_std(ts, window)
+    stats = window_stats(ts, window=window)
+    avg, std = stats['mean'], stats['std']
     avg.plot(ax=ax, color=c, ls='-')
     ax.fill_between(avg.index, avg-2*std, avg+2*std, color=c, alpha=0.25)
 
@@ -288,9 +924,63 @@ def rolling_plot(ax, ts, window, c='b'):
 # Map elements
 # ------------
 
+def apply_tiled(func, z, halo=1, tilesize=1024, dtype='float32', out=None,
+                workers=None):
+    """
+    Apply a local array function block by block with halo overlap.
+
+    Parameters
+    ----------
+    func: callable
+        Function mapping a 2D block to an array of the same shape, whose
+        values only depend on neighbours within halo cells.
+    z: array
+        Input 2D array, e.g. a digital elevation model.
+    halo: integer
+        Number of overlapping cells read around each tile.
+    tilesize: integer
+        Number of rows and columns in each output tile.
+    dtype: dtype
+        Data type blocks are converted to before applying func. Masked
+        input cells are filled with NaN, and output cells that are not
+        finite are masked.
+    out: array, optional
+        Preallocated output array, defaults to a new array of given dtype.
+    workers: integer, optional
+        Number of threads processing tiles, defaults to the number of cores.
+    """
+
+    # preallocate output
+    rows, cols = z.shape
+    out = np.empty(z.shape, dtype=dtype) if out is None else out
+
+    # process one tile and write interior into output
+    def process(row0, col0):
+        row1, col1 = min(row0+tilesize, rows), min(col0+tilesize, cols)
+        rowa, cola = max(row0-halo, 0), max(col0-halo, 0)
+        rowb, colb = min(row1+halo, rows), min(col1+halo, cols)
+        block = np.ma.filled(np.ma.asarray(
+            z[rowa:rowb, cola:colb], dtype=dtype), np.nan)
+        block = func(block)
+        out[row0:row1, col0:col1] = block[row0-rowa:row1-rowa,
+                                          col0-cola:col1-cola]
+
+    # distribute tiles over a thread pool (numpy releases the gil)
+    tiles = itertools.product(range(0, rows, tilesize),
+                              range(0, cols, tilesize))
+    with concurrent.futures.ThreadPoolExecutor(workers) as pool:
+        list(pool.map(lambda tile: process(*tile), tiles))
+
+    # return output, masking invalid cells for masked input
+    if np.ma.isMaskedArray(z):
+        out = np.ma.masked_invalid(out)
+    return out
+
+
 def shading(z, dx=None, dy=None, extent=None, azimuth=315.0, altitude=30.0,
-            transparent=False):
-    """Compute shaded relief map."""
+            transparent=False, **kwargs):
+    """Compute shaded relief map. Additional keyword arguments are passed to
+    apply_tiled."""
 
     # get horizontal resolution
     if (dx is None or dy is None) and (extent is None):
@@ -313,12 +1003,15 @@ def shading(z, dx=None, dy=None, extent=None, azimuth=315.0, altitude=30.0,
         zlight = 0.0
 
     # compute hillshade (dot product of normal and light direction vectors)
-    u, v = np.gradient(z, dx, dy)
-    return (zlight - u*xlight - v*ylight) / (1 + u**2 + v**2)**(0.5)
+    def func(z):
+        u, v = np.gradient(z, dx, dy)
+        return (zlight - u*xlight - v*ylight) / (1 + u**2 + v**2)**(0.5)
+    return apply_tiled(func, z, halo=1, **kwargs)
 
 
-def slope(z, dx=None, dy=None, extent=None, smoothing=None):
-    """Compute slope map with optional smoothing."""
+def slope(z, dx=None, dy=None, extent=None, smoothing=None, **kwargs):
+    """Compute slope map with optional smoothing. Additional keyword arguments
+    are passed to apply_tiled."""
 
     # get horizontal resolution
     if (dx is None or dy is None) and (extent is None):
@@ -327,17 +1020,19 @@ def slope(z, dx=None, dy=None, extent=None, smoothing=None):
     dx = dx or (extent[1]-extent[0])/cols
     dy = dy or (extent[2]-extent[3])/rows
 
-    # optionally smooth data
+    # optionally smooth data, widening the halo to the gaussian kernel radius
+    halo = 1
     if smoothing:
         import scipy.ndimage as ndimage
-        z = ndimage.filters.gaussian_filter(z, smoothing)
-
-    # compute gradient along each coordinate
-    u, v = np.gradient(z, dx, dy)
-
-    # compute slope
-    slope = (u**2 + v**2)**0.5
-    return slope
+        halo += int(4*smoothing+0.5)
+
+    # compute slope from gradient along each coordinate
+    def func(z):
+        if smoothing:
+            z = ndimage.gaussian_filter(z, smoothing)
+        u, v = np.gradient(z, dx, dy)
+        return (u**2 + v**2)**0.5
+    return apply_tiled(func, z, halo=halo, **kwargs)
 
 
 def extent_from_coords(x, y):
@@ -0,0 +1,39 @@
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""
+Bowdoin lazy imports. Heavy modules used by some code paths only, such as
+GDAL, geopandas, xarray or scipy submodules, are replaced by placeholders
+that import the actual module on first attribute access. Placeholders are
+not registered in sys.modules, so that a regular import elsewhere still
+executes the module, e.g. to register xarray accessors.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder importing the actual module on first use."""
+
+    def __getattr__(self, attr):
+        """Import the actual module and return the requested attribute."""
+        return getattr(self._load(), attr)
+
+    def _load(self):
+        """Import the actual module, or look it up once imported."""
+        return importlib.import_module(self.__name__)
+
+
+def lazy_import(name):
+    """Return a module if already imported, or a lazy placeholder."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+def load(module):
+    """Import a lazy module now, e.g. to register its xarray accessors."""
+    if isinstance(module, LazyModule):
+        return module._load()  # pylint: disable=protected-access
+    return module
@@ -8,7 +8,6 @@
 import absplots as apl
 import geopandas as gpd
 import matplotlib.pyplot as plt
-import xarray as xr
 
 import bowtem_utils
 
@@ -90,11 +89,9 @@ def main():
     # initialize figure
     fig, grid = init_figure()
 
-    # plot Sentinel image
-    img = xr.open_dataarray('../data/native/20160410_180125_659_S2A_RGB.jpg')
-    img = img.astype(int)  # tell imshow to interpret RGB values as 0 to 256
+    # plot Sentinel image at the resolution of each panel
     for ax in grid.values():
-        img.plot.imshow(ax=ax, add_labels=False)
+        bowtem_utils.plot_sentinel_image(ax, '20160410_180125_659_S2A_RGB')
 
     # plot all sample locations on the main panel
     gdf = gpd.read_file('../data/locations.gpx').set_index('name')
@@ -8,6 +8,7 @@
 import absplots as apl
 
 import bowstr_utils
+import bowtem_utils
 
 
 def plot(filt='24hhp'):
@@ -37,6 +38,7 @@ def plot(filt='24hhp'):
                 'Pituffik\ntide'r'$\,/\,$10' if unit == 'tide' else
                 f'{unit}\n{depth[unit]:.0f}'r'$\,$m')
             pres[unit].plot(ax=ax, color=color, legend=False)
+            bowtem_utils.decimate_lines(ax)
             ax.text(
                 1.01, 0, label, color=color, fontsize=6, fontweight='bold',
                 transform=ax.transAxes)
@@ -81,18 +81,21 @@ def main():
     # plot pressure data in top panels
     for ax in axes[0]:
         pres.plot(ax=ax, legend=False)
+        bowtem_utils.decimate_lines(ax)
         add_closure_dates(ax, pres, date)
         bowtem_utils.add_field_campaigns(ax=ax, ytext=0.02)
 
     # plot temperature data in bottom panels
     for ax in axes[1]:
         temp.plot(ax=ax, legend=False)
+        bowtem_utils.decimate_lines(ax)
         add_closure_dates(ax, temp, date)
         bowtem_utils.add_field_campaigns(ax=ax, ytext=None)
 
     # plot pressure data in insets
     for ax in insets:
         pres.plot(ax=ax, legend=False)
+        bowtem_utils.decimate_lines(ax)
 
     # add unit labels
     add_unit_labels(axes[0, 1], pres, depth, offsets={
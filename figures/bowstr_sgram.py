@@ -9,10 +9,13 @@ import absplots as apl
 import matplotlib as mpl
 import numpy as np
 import pandas as pd
-import pywt
 
+import bowlazy
 import bowstr_utils
 
+# heavy modules imported on first use
+pywt = bowlazy.lazy_import('pywt')
+
 
 def plot_cwt(series, ax):
     """Plot spectrogram from continuous wavelet transform."""
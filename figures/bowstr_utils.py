@@ -8,6 +8,7 @@ Bowdoin stress paper utils.
 
 import glob
 import argparse
+import functools
 import itertools
 import multiprocessing
 import os.path
@@ -17,9 +18,13 @@ import time
 import matplotlib as mpl
 import numpy as np
 import pandas as pd
-import scipy.signal as sg
 
+import bowdata
 import bowtem_utils
+import bowlazy
+
+# heavy modules imported on first use
+sg = bowlazy.lazy_import('scipy.signal')
 
 # Physical constants
 # ------------------
@@ -78,11 +83,13 @@ def is_multiline(filename):
     return line != ''
 
 
+@bowdata.served
 def load(interp=False, filt=None, resample=None, tide=False, variable='wlev'):
     """Load inclinometer variable data for all boreholes."""
 
     # load all inclinometer data for this variable
-    pattern = '../data/processed/bowdoin.*.inc.' + variable + '.csv'
+    pattern = '../data/processed/bowdoin.*.inc.' + variable + (
+        '.nc' if variable in ('base', 'dept') else '.csv')
     data = [bowtem_utils.load(f) for f in glob.glob(pattern)]
     data = pd.concat(data, axis=1)
 
@@ -137,22 +144,25 @@ def load(interp=False, filt=None, resample=None, tide=False, variable='wlev'):
 
 
 def load_freezing_dates(fraction=0.8):
-    """Load freezing dates."""
+    """Load freezing dates as a new series, safe to modify."""
+    return _detect_freezing_dates(fraction).copy()
+
+
+@functools.lru_cache
+def _detect_freezing_dates(fraction):
+    """Detect freezing dates once per fraction (do not modify result)."""
 
     # load hourly temperature data
     temp = load(variable='temp').resample('1h').mean()
 
-    # remove a long-term warming tail
-    for unit, series in temp.items():
-        temp[unit] = series.where(series.index < series.idxmin())
-
-    # compute date when temp has reached fraction of min
-    date = abs(temp-fraction*temp.min()).idxmin()
+    # compute date when temp has reached fraction of min before warming tail
+    date = bowtem_utils.detect_events(temp, fraction=fraction).crossing
 
     # return as freezing dates
     return date
 
 
+@bowdata.served
 def load_bowdoin_tides(order=2, cutoff=1/3600.0):
     """Return Masahiro filtered sea level in a data series."""
 
@@ -169,6 +179,7 @@ def load_bowdoin_tides(order=2, cutoff=1/3600.0):
     return tide
 
 
+@bowdata.served
 def load_pituffik_tides(start='2014-07', end='2017-08', unit='kPa'):
     """Load UNESCO IOC 5-min Pituffik tide data."""
 
@@ -31,7 +31,7 @@ def main():
         temp = temp.resample('6h').mean()
 
         # estimate closure times
-        closure_times = bowtem_utils.estimate_closure_state(bh, temp).time
+        closure_times = bowtem_utils.estimate_closure_state(bh, freq='6h').time
         closure_times = closure_times.dt.total_seconds()/(24*3600)
 
         # for each sensor type
@@ -9,6 +9,8 @@ from scipy import stats
 import xarray as xr
 import absplots as apl
 
+import bowtem_utils
+
 
 def main():
     """Main program called during execution."""
@@ -66,27 +68,7 @@ def main():
         'WV02_20210908_10300100C5296800_10300100C567F700_2m_seg2']      # 0.95
 
     # Arctic DEM strips with good coverage and quality
-    datastrips = [
-        'WV01_20120730_102001001C3CA200_102001001C997D00_2m_lsf_seg2',  # 0.83
-        'WV02_20130404_1030010020AC5E00_1030010021347000_2m_lsf_seg1',  # 1.00
-        'WV01_20140906_10200100318E9F00_1020010033454500_2m_lsf_seg2',  # 0.71
-        'WV02_20140906_103001003766BC00_1030010036B2F000_2m_lsf_seg2',  # 0.81
-        'WV02_20150419_10300100403C2300_1030010041149700_2m_lsf_seg1',  # 1.00
-        'WV02_20160424_10300100566BCD00_103001005682C900_2m_lsf_seg1',  # 0.95
-        'WV02_20160504_10300100557E8400_1030010055147100_2m_lsf_seg1',  # 0.75
-        'WV01_20170318_10200100602AB700_102001005FDC9000_2m_lsf_seg1',  # 1.00
-        'WV03_20180424_104001003C59FD00_104001003C25E800_2m_lsf_seg1',  # 0.90
-        'WV01_20180502_10200100747CC100_10200100765FE000_2m_lsf_seg1',  # 1.00
-        'WV02_20200318_10300100A3C33B00_10300100A5617100_2m_lsf_seg1',  # 0.76
-        'WV02_20200410_10300100A31A0600_10300100A36D6500_2m_lsf_seg1',  # 0.89
-        'W1W1_20200606_10200100965E3000_102001009A43F300_2m_lsf_seg5',  # 0.75
-        'WV03_20201002_1040010060C03000_1040010061634200_2m_lsf_seg1',  # 0.96
-        'WV02_20210501_10300100BD76C300_10300100BE22CD00_2m_lsf_seg1',  # 1.00
-        'W1W1_20210922_10200100B6DF1C00_10200100B787C400_2m_seg2',      # 0.92
-        'WV01_20220418_10200100C1DA0E00_10200100C4A08100_2m_lsf_seg1',  # 0.96
-        'WV01_20230626_10200100DAA77300_10200100DBCCB300_2m_seg1',      # 1.00
-        'WV01_20240701_10200100F18B1E00_10200100F1AFEA00_2m_seg1',      # 0.90
-        'WV03_20240706_10400100989EFC00_1040010098D1C000_2m_seg1']      # 0.62
+    datastrips = bowtem_utils.load_dem_strips()
 
     # initialize figure
     fig, grid = apl.subplots_mm(
@@ -103,7 +85,7 @@ def main():
     strip = datastrips[0]
     with xr.open_dataarray(
             f'../data/external/SETSM_s2s041_{strip}.tif') as da0:
-        da0 = da0.where(da0 > -9999).squeeze()
+        da0 = da0.squeeze()
         im0 = da0.plot.imshow(
             ax=grid.flat[0], add_colorbar=False, add_labels=False,
             cmap='PuOr_r', vmin=0, vmax=200)
@@ -113,7 +95,7 @@ def main():
         ax = grid.flat[i+1]
         with xr.open_dataarray(
                 f'../data/external/SETSM_s2s041_{strip}.tif') as da1:
-            da1 = da1.where(da1 > -9999).squeeze() - da0
+            da1 = da1.squeeze() - da0
             da1 = da1 - stats.mode(da1, axis=None, nan_policy='omit')[0]
             im1 = da1.plot.imshow(
                 ax=ax, add_colorbar=False, add_labels=False, cmap='RdBu',
@@ -7,12 +7,10 @@
 
 from scipy import stats
 import hyoga  # noqa pylint: disable=unused-import
-import geopandas as gpd
 import pandas as pd
 import xarray as xr
 import matplotlib.pyplot as plt
 import absplots as apl
-import pyproj
 import bowtem_utils
 
 
@@ -45,40 +43,17 @@ def project_borehole_locations(date, crs):
     """
 
     # read initial positions from GPX file
-    gdf = gpd.read_file('../data/locations.gpx').set_index('name').to_crs(crs)
-    gdf = gdf[gdf.index.str.startswith('B14')]
-    gdf = gdf.set_index(gdf.index.str[3:].str.lower())
-    initial = gdf.geometry.get_coordinates()
-
-    # interpolate DEM date BH1 location from continuous GPS
-    trans = pyproj.Transformer.from_crs('+proj=lonlat', crs)
-    gps = bowtem_utils.load('../data/processed/bowdoin.bh1.gps.csv')
-    gps = gps.interpolate().loc[date].mean()
-    gps['x'], gps['y'] = trans.transform(gps.lon, gps.lat)
-    gps = gps[['x', 'y']]
-
-    # compute DEM date positions from BH1 displacement with time mutliplier
-    displacement = gps - initial.loc['bh1']
-    date = pd.to_datetime(date, utc=True)
-    date_init = pd.to_datetime(gdf.time)
-    multiplier = (date - date_init.bh1) / (date - date_init)
-    displacement = displacement.apply(lambda x: x*multiplier).T
-    projected = initial + displacement
+    initial = bowtem_utils.load_borehole_waypoints(crs)[['x', 'y']]
+
+    # estimate positions at midday as a proxy for daily mean positions
+    date = pd.to_datetime(date) + pd.to_timedelta('12h')
+    x, y = bowtem_utils.locate_boreholes(date, crs=crs)
+    projected = pd.DataFrame({'x': x.iloc[0], 'y': y.iloc[0]})
 
     # return initial and projected locations
     return initial, projected
 
 
-def project_location(x, y, loc):
-    """
-    Find the distance along a profile corresponding to the nearest point of
-    the profile to a given location.
-    """
-    dist = ((x-loc.x)**2+(y-loc.y)**2)**0.5
-    dist = dist.where(dist == dist.min(), drop=True).d
-    return dist
-
-
 def main():
     """Main program called during execution."""
 
@@ -93,13 +68,13 @@ def main():
     # load reference elevation data
     elev = xr.open_dataarray(f'../data/external/SETSM_s2s041_{st0}.tif')
     elev = elev.squeeze()
-    elev = elev.loc[-1224000:-1229000, -537500:-532500].where(elev > -9999)
+    elev = elev.loc[-1224000:-1229000, -537500:-532500]
     zoom = elev.loc[-1226725:-1227025, -535075:-534775]  # 300x300 m
 
     # load elevation difference data
     diff = xr.open_dataarray(f'../data/external/SETSM_s2s041_{st1}.tif')
     diff = diff.squeeze()
-    diff = diff.loc[-1224000:-1229000, -537500:-532500].where(diff > -9999)
+    diff = diff.loc[-1224000:-1229000, -537500:-532500]
     diff = diff - elev
     diff = diff - stats.mode(diff, axis=None, nan_policy='omit')[0]
 
@@ -126,7 +101,7 @@ def main():
 
     # plot borehole locations on the map
     ax = grid[0]
-    crs = '+proj=stere +lat_0=90 +lon_0=-45 +lat_ts=70'
+    crs = bowtem_utils.DEM_CRS
     initial, projected = project_borehole_locations(st0[5:13], crs=crs)
     for bh in ('bh1', 'bh2', 'bh3'):
         color = bowtem_utils.COLOURS[bh]
@@ -156,10 +131,9 @@ def main():
     zoom.to_dataset().hyoga.plot.scale_bar(ax=grid[0], label=r'50$\,$m')
     elev.to_dataset().hyoga.plot.scale_bar(ax=grid[1])
 
-    # interpolate along profile
-    flowline = gpd.read_file('../data/native/flowline.shp').to_crs(crs)
-    elev = elev.isel(y=slice(None, None, -1))  # work around hyoga issue #117
-    elev = elev.to_dataset().hyoga.profile(flowline, interval=10).band_data
+    # look up cached profile along flowline
+    elev = bowtem_utils.load_flowline_profiles()
+    elev = elev.swap_dims(time='strip').sel(strip=st0)
     elev = elev[elev.d < 5000]
 
     # plot map-view and topographic profiles
@@ -167,9 +141,11 @@ def main():
     elev.plot(ax=pfax, color='0.25')
 
     # mark borehole locations along profile
+    dists = pd.Series(bowtem_utils.project_to_flowline(
+        projected.x, projected.y), index=projected.index)
     for bh in ['bh2', 'bh3']:
         color = bowtem_utils.COLOURS[bh]
-        dist = project_location(elev.x, elev.y, projected.loc[bh])
+        dist = dists[bh]
         pfax.axvline(dist, color=color)
         pfax.text(dist, 40, ' '+bh.upper()+' ', color=color, fontweight='bold',
                   ha=('left' if bh == 'bh2' else 'right'))
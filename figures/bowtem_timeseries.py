@@ -43,7 +43,8 @@ def main():
         temp, depth, _ = bowtem_utils.load_all(bh)
         temp = temp.resample('1D').mean()
         for ax in axes:
-            ax.plot(temp.index, temp.values, c=color)
+            lines = ax.plot(temp.index, temp.values, c=color)
+            bowtem_utils.decimate_lines(ax, lines)
         # temp.plot(ax=ax, c=color, legend=False)  # fails (issue #40)
 
         # plot manual readings
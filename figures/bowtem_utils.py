@@ -6,15 +6,28 @@
 Bowdoin temperature paper utils.
 """
 
+import functools
 import glob
+import os.path
 
-import geopandas as gpd
-import hyoga
 import matplotlib.pyplot as plt
 import matplotlib.transforms as mtransforms
 import numpy as np
 import pandas as pd
-import xarray as xr
+
+import bowdata
+import bowlazy
+
+# heavy modules imported on first use
+gpd = bowlazy.lazy_import('geopandas')
+hyoga = bowlazy.lazy_import('hyoga')
+pyproj = bowlazy.lazy_import('pyproj')
+rasterio = bowlazy.lazy_import('rasterio')
+rioxarray = bowlazy.lazy_import('rioxarray')
+sinterp = bowlazy.lazy_import('scipy.interpolate')
+slinalg = bowlazy.lazy_import('scipy.linalg')
+sspatial = bowlazy.lazy_import('scipy.spatial')
+xr = bowlazy.lazy_import('xarray')
 
 # Global parameters
 # -----------------
@@ -28,6 +41,23 @@ PROFILES_DATES = {
     'bh3': ['20150101', '20151112', '20160719'],
     'err': ['20150101', '20160719']}
 
+# Arctic DEM projection (strips are listed in ../data/arcticdem-strips.txt)
+DEM_CRS = '+proj=stere +lat_0=90 +lon_0=-45 +lat_ts=70'
+
+# Physical constants
+ACTIV_ENERGY = 115e3    # Flow law act. ener.,  J mol-1         (CP10, p. 74)
+CLAPEYRON = 7.9e-8      # Clapeyron constant,   K Pa-1          (LU02)
+CAPACITY = 2097         # Ice spec. heat cap.,  J kg-1 K-1      (CP10, p. 400)
+CONDUCTIVITY = 2.10     # Ice thermal cond.,    J m-1 K-1 s-1   (CP10, p. 400)
+DENSITY = 917           # Ice density,          kg m-3          (CP10, p. 12)
+GAS_CONSTANT = 8.314    # Ideal gas constant,   J mol-1 K-1     (CP10, p. 72)
+GRAVITY = 9.80665       # Standard gravity,     m s-2           (--)
+HARDNESS = 3.5e-25      # Ice hardness coeff.,  Pa-3 s-1        (CP10 p. 74)
+
+# References
+# - CP10: CP10
+# - LU02: Lüthi et al., 2002
+
 
 # Plotting methods
 # ----------------
@@ -124,6 +154,102 @@ def add_subfig_labels(axes=None, colors=None, **kwargs):
         add_subfig_label('('+label+')', ax=ax, color=color, **kwargs)
 
 
+# Line decimation methods
+# -----------------------
+
+def decimate(x, y, xlim, xpix, method='m4', bins=2):
+    """
+    Return indices of the points of a line with increasing x-coordinates
+    needed to draw it within x-limits spanning given display pixel bounds.
+
+    The m4 method keeps the first, last, minimum and maximum points in each
+    bin, so that a thin rasterized line is unchanged. The lttb method keeps
+    the point forming the largest triangle with its neighbours in each bin.
+    Default half-pixel bins keep antialiasing differences on lines thicker
+    than a pixel barely visible. Both methods keep points bounding missing
+    values so that data gaps remain visible, and one point on each side of
+    the x-limits so that the line reaches the axes edges.
+    """
+
+    # select visible points, return them all if few enough
+    width = bins * (xpix[1]-xpix[0])
+    start = max(np.searchsorted(x, xlim[0], side='right')-1, 0)
+    stop = min(np.searchsorted(x, xlim[1], side='left')+1, len(x))
+    index = np.arange(start, stop)
+    isnan = np.isnan(y[index])
+    valid = index[~isnan]
+    if len(valid) <= 4 * width:
+        return index
+
+    # keep the points bounding missing values
+    edges = np.flatnonzero(np.diff(isnan))
+    gaps = index[np.concatenate((edges, edges+1))]
+
+    # keep first, last, min and max point in each bin
+    if method == 'm4':
+        cols = np.floor(bins*xpix[0] + (x[valid]-xlim[0]) * (
+            width / (xlim[1]-xlim[0]))).astype(int)
+        firsts = np.flatnonzero(np.diff(cols, prepend=cols[0]-1))
+        lasts = np.append(firsts[1:], len(cols)) - 1
+        order = np.lexsort((y[valid], cols))
+        kept = valid[np.concatenate((
+            firsts, lasts, order[firsts], order[lasts]))]
+
+    # keep the largest triangle point in each bin of equal point count
+    elif method == 'lttb':
+        bounds = np.linspace(1, len(valid)-1, int(width)+1).astype(int)
+        kept = [valid[0]]
+        for lo, mid, hi in zip(bounds[:-1], bounds[1:], [*bounds[2:], None]):
+            x0, y0 = x[kept[-1]], y[kept[-1]]
+            x1, y1 = x[valid[lo:mid]], y[valid[lo:mid]]
+            x2, y2 = x[valid[mid:hi]].mean(), y[valid[mid:hi]].mean()
+            area = np.abs((x0-x2)*(y1-y0) - (x0-x1)*(y2-y0))
+            kept.append(valid[lo+area.argmax()])
+        kept = np.array(kept+[valid[-1]])
+
+    # other methods are not implemented
+    else:
+        raise ValueError(f'Unrecognized decimation method {method}.')
+
+    # return sorted unique indices
+    return np.unique(np.concatenate((kept, gaps)))
+
+
+def decimate_lines(ax=None, lines=None, **kwargs):
+    """
+    Decimate long lines to the pixel width of the axes, and decimate again
+    from the full data each time the x-limits change, e.g. in zoomed insets.
+    Lines with markers or non-monotonic x-coordinates are left unchanged.
+    Call this after plotting, on axes drawn at the saved figure resolution.
+    Keyword arguments are passed to decimate.
+    """
+
+    # get axes and lines if None provided
+    ax = ax or plt.gca()
+    lines = ax.get_lines() if lines is None else lines
+
+    # store full data in converted units, e.g. for pandas period axes
+    data = []
+    for line in lines:
+        x = np.asarray(line.get_xdata(orig=False), dtype=float)
+        y = np.asarray(line.get_ydata(orig=False), dtype=float)
+        if line.get_marker() in ('None', '', ' ', None) and (
+                np.all(np.diff(x) >= 0)):
+            data.append((line, x, y))
+
+    # decimate to current x-limits and pixel width
+    def update(ax):
+        xlim = sorted(ax.get_xlim())
+        xpix = ax.bbox.intervalx
+        for line, x, y in data:
+            index = decimate(x, y, xlim, xpix, **kwargs)
+            line.set_data(x[index], y[index])
+
+    # decimate now and on x-limits changes
+    update(ax)
+    ax.callbacks.connect('xlim_changed', update)
+
+
 # Annotation methods
 # ------------------
 
@@ -182,8 +308,7 @@ def annotate_by_compass(*args, ax=None, color=None, point='ne', offset=8,
 def annotate_location(
         name, crs=None, marker='o', point=None, text=None, **kwargs):
     """Plot and annotate a geographic location."""
-    gdf = gpd.read_file('../data/locations.gpx').set_index('name').loc[[name]]
-    gdf = gdf.to_crs(crs)
+    gdf = load_waypoints().loc[[name]].to_crs(crs)
     gdf.plot(marker=marker, **kwargs)
     if text is not None:
         coords = gdf.loc[name].geometry.coords[0]
@@ -193,13 +318,26 @@ def annotate_location(
 # Data loading methods
 # --------------------
 
+@functools.lru_cache
+def load_dem_strips():
+    """Load Arctic DEM strip names shared with the data retrieval script."""
+    with open('../data/arcticdem-strips.txt', encoding='utf-8') as file:
+        return tuple(name for line in file
+                     if (name := line.split('#')[0].strip()))
+
+
 def load(filename):
     """Load preprocessed data file and return data with duplicates removed."""
-    data = pd.read_csv(filename, parse_dates=True, index_col='date')
+    if filename.endswith('.nc'):
+        with xr.open_dataset(filename) as ds:
+            data = ds.to_dataframe().astype('float64')
+    else:
+        data = pd.read_csv(filename, parse_dates=True, index_col='date')
     data = data.groupby(level=0).mean()
     return data
 
 
+@bowdata.served
 def load_all(borehole):
     """Load all temperature and depths for the given borehole."""
 
@@ -207,9 +345,9 @@ def load_all(borehole):
     prefix = '../data/processed/bowdoin.' + borehole.replace('err', 'bh3')
     temp = [load(f) for f in glob.glob(prefix+'*.temp.csv')]
     temp = pd.concat(temp, axis=1)
-    dept = [load(f) for f in glob.glob(prefix+'*.dept.csv')]
+    dept = [load(f) for f in glob.glob(prefix+'*.dept.nc')]
     dept = pd.concat(dept, axis=1)
-    base = [load(f) for f in glob.glob(prefix+'*.base.csv')]
+    base = [load(f) for f in glob.glob(prefix+'*.base.nc')]
     base = pd.concat(base, axis=1)
 
     # in this paper with ignore depth changes
@@ -256,31 +394,87 @@ def load_manual(borehole):
     return manu, mask
 
 
-def load_profiles(borehole):
+def load_profiles(borehole, dates=None):
     """
     Load temperature profiles for selected dates from auto or manual data.
+    Data are loaded once and averaged daily, using manual readings for dates
+    without automatic data. Returns profiles with sensors as index and date
+    strings (YYYYMMDD) as columns, keeping sensors with data at the first date.
     """
 
-    # load automatic data and init results dataframe
+    # load automatic data and compute daily means
     auto, depth, base = load_all(borehole)
-    dates = PROFILES_DATES[borehole]
-    temp = pd.DataFrame()
+    dates = PROFILES_DATES[borehole] if dates is None else dates
+    dates = pd.to_datetime(dates)
+    daily = auto.groupby(auto.index.floor('D')).mean()
+    temp = daily.reindex(dates)
+
+    # load manual data once for dates without automatic data, keeping
+    # sensors that only have manual readings
+    missing = ~dates.isin(daily.index)
+    if missing.any():
+        manu, mask = load_manual(borehole)
+        manu = manu.mask(mask)
+        manu = manu.groupby(manu.index.floor('D')).mean()
+        temp = temp.reindex(columns=temp.columns.union(
+            manu.columns, sort=False))
+        temp.loc[missing] = manu.reindex(
+            index=dates[missing], columns=temp.columns).to_numpy()
+
+    # transpose and remove depths with no data
+    temp = temp.T.set_axis(dates.strftime('%Y%m%d'), axis=1)
+    temp = temp[temp.iloc[:, 0].notna()]
+    depth = depth[temp.index]
+    return temp, depth, base
+
+
+def interpolate_profiles(temp, depth, depth_new=None, step=1):
+    """
+    Interpolate temperature profiles for many dates using cubic splines.
+    Dates sharing the same valid sensors are interpolated in a single call.
 
-    # for each date
-    for date in dates:
+    Parameters
+    ----------
+    temp: dataframe
+        Temperature profiles with sensors as index and dates as columns.
+    depth: series
+        Sensor depths sorted in increasing order.
+    depth_new: array, optional
+        Common depth grid, defaults to the valid depth range at step interval.
+    step: scalar
+        Grid interval used if depth_new is not provided.
 
-        # use automatic data if available
-        if date in auto.index:
-            temp[date] = auto.loc[date].mean().dropna()
+    Returns
+    -------
+    temp_new: dataframe
+        Interpolated profiles with depths as index, not-a-number outside each
+        profile's valid depth range.
+    """
 
-        # otherwise load manual data
-        else:
-            manu, mask = load_manual(borehole)
-            temp[date] = manu.mask(mask).loc[date].squeeze().dropna()
+    # ignore isolated points and nans
+    valid = temp.notna()
+    valid &= (valid.shift(-1, fill_value=False) |
+              valid.shift(1, fill_value=False))
+    valid = valid.to_numpy()
 
-    # remove depths with no data
-    depth = depth[temp.index]
-    return temp, depth, base
+    # default to a regular depth grid covering all valid sensors
+    if depth_new is None:
+        valid_depth = depth[valid.any(axis=1)]
+        depth_new = np.arange(valid_depth.iloc[0], valid_depth.iloc[-1], step)
+
+    # interpolate dates by groups of identical valid sensors
+    values = temp.to_numpy()
+    result = np.full((len(depth_new), temp.shape[1]), np.nan)
+    patterns, groups = np.unique(valid.T, axis=0, return_inverse=True)
+    for i, pattern in enumerate(patterns):
+        if pattern.sum() > 3:
+            cols = groups.ravel() == i
+            result[:, cols] = sinterp.interp1d(
+                depth[pattern], values[pattern][:, cols], axis=0,
+                kind='cubic', bounds_error=False)(depth_new)
+
+    # return as a dataframe
+    return pd.DataFrame(result, index=depth_new, columns=temp.columns)
 
 
 def load_strain_rate(borehole, freq='1D'):
@@ -314,36 +508,588 @@ def load_strain_rate(borehole, freq='1D'):
     return exz
 
 
+# Borehole location methods
+# -------------------------
+
+@functools.lru_cache
+def get_transformer(crs):
+    """Return a cached transformer from longitude and latitude to crs."""
+    return pyproj.Transformer.from_crs('+proj=lonlat', crs)
+
+
+@functools.lru_cache
+def load_waypoints():
+    """Load GPX waypoints once in a geodataframe indexed by name."""
+    return gpd.read_file('../data/locations.gpx').set_index('name')
+
+
+@functools.lru_cache
+def load_borehole_waypoints(crs):
+    """Return initial 2014 borehole locations and survey times in crs."""
+    gdf = load_waypoints()
+    gdf = gdf[gdf.index.str.startswith('B14')].to_crs(crs)
+    gdf = gdf.set_index(gdf.index.str[3:].str.lower())
+    initial = gdf.geometry.get_coordinates()
+    initial['time'] = pd.to_datetime(gdf.time, utc=True).dt.tz_localize(None)
+    return initial
+
+
+@functools.lru_cache
+def load_gps_track(crs):
+    """Return BH1 D-GPS record times (s) and x, y coordinates in crs."""
+    gps = load('../data/processed/bowdoin.bh1.gps.csv')[['lon', 'lat']]
+    gps = gps.dropna()
+    x, y = get_transformer(crs).transform(gps.lon.values, gps.lat.values)
+    return gps.index.to_numpy(dtype='datetime64[s]').astype(float), x, y
+
+
+def locate_boreholes(dates, crs='+proj=utm +zone=19'):
+    """
+    Estimate borehole locations at given dates based their initial positions
+    measured by hand-held GPS and the continuous D-GPS record at BH1.
+
+    Parameters
+    ----------
+    dates: datetime-like or sequence of datetime-like
+        Dates at which to estimate borehole locations, assumed UTC if naive.
+    crs: string
+        Coordinate reference system of the returned locations.
+
+    Returns
+    -------
+    x, y: dataframes
+        Borehole coordinates with dates as index and boreholes as columns,
+        not-a-number outside the D-GPS record.
+    """
+
+    # convert dates to seconds, using UTC for time zone aware dates
+    dates = pd.DatetimeIndex(np.atleast_1d(dates))
+    if dates.tz is not None:
+        dates = dates.tz_convert('UTC').tz_localize(None)
+    time = dates.to_numpy(dtype='datetime64[s]').astype(float)[:, None]
+
+    # load initial locations and times of survey
+    initial = load_borehole_waypoints(crs)
+    init_time = initial.time.to_numpy(dtype='datetime64[s]').astype(float)
+
+    # interpolate BH1 displacement since survey from continuous GPS
+    gps_time, gps_x, gps_y = load_gps_track(crs)
+    displ_x = np.interp(time, gps_time, gps_x, left=np.nan, right=np.nan)
+    displ_y = np.interp(time, gps_time, gps_y, left=np.nan, right=np.nan)
+    displ_x -= initial.x['bh1']
+    displ_y -= initial.y['bh1']
+
+    # scale displacement by time elapsed since each borehole survey
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = (time - init_time) / (time - init_time[initial.index == 'bh1'])
+    x = initial.x.values + displ_x * ratio
+    y = initial.y.values + displ_y * ratio
+
+    # return as dataframes
+    x = pd.DataFrame(x, index=dates, columns=initial.index)
+    y = pd.DataFrame(y, index=dates, columns=initial.index)
+    return x, y
+
+
+# Flowline profile methods
+# ------------------------
+
+@functools.lru_cache
+def load_flowline(interval=10.0):
+    """
+    Load flowline vertices in the Arctic DEM projection and resample them at
+    regular intervals. Return a dataframe of x and y coordinates indexed by
+    distance from the calving front.
+    """
+    flowline = gpd.read_file('../data/native/flowline.shp').to_crs(DEM_CRS)
+    coords = flowline.geometry.get_coordinates().to_numpy()
+    vertices = np.append(0, np.cumsum(np.hypot(*np.diff(coords, axis=0).T)))
+    dist = np.arange(0, vertices[-1], interval)
+    return pd.DataFrame({
+        'x': np.interp(dist, vertices, coords[:, 0]),
+        'y': np.interp(dist, vertices, coords[:, 1])},
+        index=pd.Index(dist, name='d'))
+
+
+@functools.lru_cache
+def load_flowline_tree(interval=10.0):
+    """Return a KD-tree of resampled flowline points."""
+    return sspatial.cKDTree(load_flowline(interval)[['x', 'y']].to_numpy())
+
+
+def project_to_flowline(x, y, interval=10.0):
+    """
+    Return distances along the flowline of the nearest flowline points to
+    given locations, using a KD-tree to project many locations at once.
+    """
+    x, y = np.broadcast_arrays(x, y)
+    _, index = load_flowline_tree(interval).query(np.stack((x, y), axis=-1))
+    return load_flowline(interval).index.to_numpy()[index]
+
+
+def sample_flowline(strips=None, interval=10.0):
+    """
+    Sample Arctic DEM strips along the flowline in a single vectorized
+    bilinear interpolation. Only the window covering the flowline is read
+    from each strip. Return a (time, d) elevation data array.
+
+    Parameters
+    ----------
+    strips: list, optional
+        Arctic DEM strip names, default to all strips in load_dem_strips.
+    interval: scalar
+        Sampling interval along the flowline in meters.
+    """
+    strips = load_dem_strips() if strips is None else strips
+    points = load_flowline(interval)
+
+    # read four neighbouring pixels and fractional offsets for each strip
+    corners = []
+    offsets = []
+    for strip in strips:
+        with xr.open_dataarray(
+                f'../data/external/SETSM_s2s041_{strip}.tif') as da:
+            da = da.squeeze()
+            x, y = da.x.to_numpy(), da.y.to_numpy()
+            col = (points.x.to_numpy()-x[0]) / (x[1]-x[0])
+            row = (points.y.to_numpy()-y[0]) / (y[1]-y[0])
+            inside = (
+                (col >= 0) & (col <= len(x)-1) &
+                (row >= 0) & (row <= len(y)-1))
+            i = np.clip(np.floor(col).astype(int), 0, len(x)-2)
+            j = np.clip(np.floor(row).astype(int), 0, len(y)-2)
+            offsets.append([col-i, row-j])
+            window = da[j.min():j.max()+2, i.min():i.max()+2].to_numpy()
+            i, j = i-i.min(), j-j.min()
+            corners.append(np.where(inside, [
+                window[j, i], window[j, i+1],
+                window[j+1, i], window[j+1, i+1]], np.nan))
+
+    # interpolate all strips at once
+    fx, fy = np.moveaxis(np.array(offsets), 1, 0)
+    weights = np.stack(
+        [(1-fx)*(1-fy), fx*(1-fy), (1-fx)*fy, fx*fy], axis=1)
+    elev = (np.array(corners)*weights).sum(axis=1)
+
+    # return as data array
+    return xr.DataArray(
+        elev, dims=('time', 'd'), name='elevation', coords={
+            'time': pd.to_datetime([strip[5:13] for strip in strips]),
+            'strip': ('time', list(strips)), 'd': points.index,
+            'x': ('d', points.x), 'y': ('d', points.y)},
+        attrs={'long_name': 'surface elevation', 'units': 'm'})
+
+
+@functools.lru_cache
+def load_flowline_profiles(interval=10.0):
+    """
+    Load Arctic DEM elevation profiles along the flowline as a (time, d) data
+    array, sampling all strips on first call and caching them in a netCDF
+    file. Cached profiles are recomputed if the list of strips changed.
+    """
+    filename = f'../data/processed/bowdoin.flowline.{interval:g}m.nc'
+    if os.path.isfile(filename):
+        profiles = xr.load_dataarray(filename)
+        if tuple(profiles.strip.values) == load_dem_strips():
+            return profiles
+    profiles = sample_flowline(interval=interval)
+    profiles.to_netcdf(filename)
+    return profiles
+
+
 # Data processing methods
 # -----------------------
 
-def estimate_closure_state(borehole, temp):
+def detect_events(temp, start=None, fraction=0.8):
+    """
+    Detect temperature events for all units in a single pass over the
+    (time, unit) array. Units without data get not-a-time dates.
+
+    Returns a dataframe indexed by unit containing the following dates:
+
+    * closure: steepest cooling (minimum time difference) after start.
+    * refreeze: minimum temperature, after which long-term warming starts.
+    * crossing: temperature closest to a fraction of the minimum temperature
+      before refreeze, excluding the minimum itself.
+
+    Parameters
+    ----------
+    temp: dataframe
+        Temperature time series, e.g. daily or hourly means.
+    start: datetime-like, optional
+        Start date for the steepest cooling search.
+    fraction: scalar
+        Fraction of the minimum temperature defining the crossing.
+    """
+
+    # index of minimum along time, -1 for all-nan columns
+    def argmin(values):
+        valid = ~np.isnan(values)
+        values = np.where(valid, values, np.inf)
+        return np.where(valid.any(axis=0), values.argmin(axis=0), -1)
+
+    # steepest cooling after start
+    values = temp.to_numpy(dtype='float64')
+    first = 0 if start is None else temp.index.searchsorted(start)
+    closure = argmin(np.diff(values[first:], axis=0))
+    closure = np.where(closure < 0, -1, closure + first + 1)
+
+    # minimum temperature and fractional crossing before minimum
+    refreeze = argmin(values)
+    before = np.where(np.arange(len(temp))[:, None] < refreeze, values, np.nan)
+    with np.errstate(invalid='ignore'):
+        crossing = argmin(abs(before - fraction*np.fmin.reduce(before)))
+
+    # convert positions to dates
+    dates = np.append(temp.index.to_numpy(), np.datetime64('NaT'))
+    return pd.DataFrame({
+        'closure': dates[closure], 'refreeze': dates[refreeze],
+        'crossing': dates[crossing]}, index=temp.columns)
+
+
+def estimate_closure_state(borehole, freq='1D'):
     """
     Estimate borehole closure dates from temperature time series. Look for the
     steepest cooling starting one day after the date of drilling. This seems to
     work best using daily-averaged time series. In practice this does not seem
     to work on sensors for which the beginning of the record is missing.
 
-    Returns a dataframe containing closure dates, the corresponding
-    temperatures and time since the drilling for each unit.
+    Returns a new dataframe, safe to modify, containing closure dates, the
+    corresponding temperatures and time since the drilling for each unit.
 
     Parameters
     ----------
     borehole: string
-        Borehole name bh1, bh2 or bh3.
-    temp: dataframe
-        Daily temperature time series.
+        Borehole name bh1, bh2, bh3 or err.
+    freq: string
+        Frequency of temperature averages used in the detection.
     """
+    return _estimate_closure_state(borehole, freq).copy()
+
+
+@functools.lru_cache
+def _estimate_closure_state(borehole, freq):
+    """Estimate closure state once per borehole (do not modify result)."""
+    temp = load_all(borehole)[0].resample(freq).mean()
     drilling_date = DRILLING_DATES[borehole.replace('err', 'bh3')]
     drilling_date = pd.to_datetime(drilling_date)
-    closure_dates = temp[drilling_date+pd.to_timedelta('1D'):].diff().idxmin()
+    closure_dates = detect_events(
+        temp, start=drilling_date+pd.to_timedelta('1D')).closure
     closure_dates = closure_dates.mask(closure_dates == temp.index[1])
-    closure_temps = [temp.loc[closure_dates[k], k] for k in temp]
+    rows = temp.index.get_indexer(closure_dates)
+    closure_temps = np.where(
+        rows >= 0, temp.to_numpy()[rows, np.arange(temp.shape[1])], np.nan)
     return pd.DataFrame({
         'date': closure_dates, 'temp': closure_temps,
         'time': closure_dates - drilling_date})
 
 
+# Thermo-mechanical methods
+# -------------------------
+
+def compute_depth_gradient(field, depth):
+    """
+    Compute the vertical gradient of a profile or of a (time, depth) field
+    along its last axis, given a one-dimensional array of sensor depths.
+    """
+    grad = np.gradient(field, np.asarray(depth), axis=-1)
+    if isinstance(field, pd.DataFrame):
+        return pd.DataFrame(grad, index=field.index, columns=field.columns)
+    if isinstance(field, pd.Series):
+        return pd.Series(grad, index=field.index)
+    return grad
+
+
+def compute_ice_hardness(temp, depth):
+    """Compute the temperature and depth-dependant ice hardness."""
+    melt_pt = compute_melting_point(depth)
+    temp_pa = 273.15+temp-melt_pt
+    temp_th = 263-melt_pt
+    coeff = np.exp(-ACTIV_ENERGY/GAS_CONSTANT*(1/temp_pa-1/temp_th))
+    return HARDNESS * coeff
+
+
+def compute_melting_point(depth):
+    """Compute the pressure-melting point from depth below the ice surface."""
+    return -CLAPEYRON * DENSITY * GRAVITY * depth
+
+
+def compute_theoretical_crevasse_depth(temp, depth, e_xx):
+    """
+    Compute theoretical crevasse depth from the minimum ice hardness along
+    the last (depth) axis and a longitudinal strain rate.
+    """
+    hardness = np.nanmin(compute_ice_hardness(temp, depth), axis=-1)
+    return 2/(DENSITY*GRAVITY) * (e_xx / hardness)**(1/3)
+
+
+def compute_theoretical_diffusion(temp, depth):
+    """Compute heat diffusion rate in J m-3 s-1 along the last axis."""
+    heat_flux = CONDUCTIVITY * compute_depth_gradient(temp, depth)
+    return compute_depth_gradient(heat_flux, depth)
+
+
+def compute_theoretical_dissipation(temp, depth, e_xx, e_xz):
+    """
+    Compute theoretical dissipation in Pa s-1 from longitudinal and shear
+    strain rates. Strain rates can be scalars, arrays broadcastable to temp,
+    or series indexed like the rows of a (time, depth) temp dataframe.
+    """
+
+    # estimate effective strain rate
+    e_e = (e_xx**2+e_xz**2)**0.5
+
+    # estimate heat dissipation
+    hardness = compute_ice_hardness(temp, depth)
+    if isinstance(e_e, pd.Series) and isinstance(hardness, pd.DataFrame):
+        return 2 * hardness.pow(-1/3).mul(e_e**(4/3), axis=0)
+    return 2 * hardness**(-1/3) * e_e**(4/3)
+
+
+def compute_theoretical_warming(temp, depth, e_xx, e_xz):
+    """
+    Compute theoretical temperature change in °C s-1 from both heat
+    diffusion and viscous dissipation.
+    """
+    diffusion = compute_theoretical_diffusion(temp, depth)
+    dissipation = compute_theoretical_dissipation(temp, depth, e_xx, e_xz)
+    return (diffusion + dissipation) / (DENSITY * CAPACITY)
+
+
+@functools.lru_cache
+def estimate_longitudinal_strain_rate():
+    """
+    Estimate longitudinal strain rate from from the evolution of distance
+    between BH1 and BH3.
+    """
+
+    # open borehole locations
+    gdf = load_waypoints().to_crs('+proj=utm +zone=19')
+
+    # compute distance between boreholes
+    x = gdf.geometry.x
+    y = gdf.geometry.y
+    dist_17 = ((x.B17BH3 - x.B17BH1)**2 + (y.B17BH3 - y.B17BH1)**2)**0.5
+    dist_14 = ((x.B14BH3 - x.B14BH1)**2 + (y.B14BH3 - y.B14BH1)**2)**0.5
+
+    # compute average time interval
+    time = pd.to_datetime(gdf.time, format='mixed', utc=True)
+    span = (time.B17BH1 - time.B14BH1 + time.B17BH3 - time.B14BH3)/2
+
+    # estimate longitudinal strain rate
+    e_xx = 2 * (dist_17 - dist_14) / (dist_17 + dist_14) / span.total_seconds()
+    return e_xx
+
+
+@functools.lru_cache
+def estimate_shear_strain_rate(borehole, start='2014-10'):
+    """
+    Estimate shear strain rate from the average observed tilt rates
+    in BH1 and BH3.
+    """
+    borehole = borehole.replace('bh2', 'bh1').replace('err', 'bh3')
+    e_xz = load_strain_rate(borehole)[start:].mean()
+    e_xz = e_xz.mean()
+    return e_xz
+
+
+def estimate_theoretical_warming(borehole, freq='1D'):
+    """
+    Compute a (time, depth) map of theoretical temperature change in °C s-1
+    from resampled borehole temperatures and constant strain rates. Sensors
+    clipped to the same depth at the glacier base are only counted once.
+    """
+    temp, depth, base = load_all(borehole)
+    temp = temp.resample(freq).mean()
+    temp = temp.loc[:, ~depth.duplicated()]
+    depth = depth[temp.columns]
+    e_xx = estimate_longitudinal_strain_rate()
+    e_xz = estimate_shear_strain_rate(borehole)
+    return compute_theoretical_warming(temp, depth, e_xx, e_xz)
+
+
+# Heat diffusion model methods
+# ----------------------------
+
+def simulate_temperature(temp, depth, times, e_xx=0.0, e_xz=0.0, step=1.0,
+                         maxdt=86400.0):
+    """
+    Simulate temperature evolution for an ensemble of initial profiles and
+    strain rates using an implicit finite-difference heat equation with
+    strain heating. Temperatures at the top and bottom sensors are held
+    constant, and are simply capped at the pressure-melting point elsewhere,
+    without modelling latent heat release or storage.
+
+    Parameters
+    ----------
+    temp: array
+        Initial temperatures in °C at sensor depths, shape (..., sensors).
+    depth: array
+        Strictly increasing sensor depths in m, at least two.
+    times: array
+        Increasing output times in s since the initial profile.
+    e_xx, e_xz: scalar or array
+        Longitudinal and shear strain rates in s-1, broadcastable to the
+        leading (ensemble) dimensions of temp.
+    step: scalar
+        Approximate model grid spacing in m.
+    maxdt: scalar
+        Maximum model time step in s.
+
+    Returns
+    -------
+    temp: array
+        Modelled temperatures at sensor depths, shape (..., times, sensors).
+    """
+
+    # check for at least two sensors bounding the model domain
+    depth = np.asarray(depth, dtype=float)
+    if depth.size < 2:
+        raise ValueError("At least two sensor depths are needed.")
+
+    # flatten ensemble dimensions
+    e_xx = np.asarray(e_xx, dtype=float)
+    e_xz = np.asarray(e_xz, dtype=float)
+    shape = np.broadcast_shapes(np.shape(temp)[:-1], e_xx.shape, e_xz.shape)
+    temp = np.broadcast_to(temp, shape+depth.shape).reshape(-1, depth.size)
+    e_xx = np.broadcast_to(e_xx, shape).reshape(-1, 1)
+    e_xz = np.broadcast_to(e_xz, shape).reshape(-1, 1)
+
+    # interpolate initial profiles on a regular grid
+    size = 1 + int(np.ceil((depth[-1]-depth[0])/step))
+    grid = np.linspace(depth[0], depth[-1], size)
+    temp = sinterp.interp1d(depth, temp, axis=-1)(grid)
+    melt_pt = compute_melting_point(grid)
+    coeff = CONDUCTIVITY / (DENSITY*CAPACITY) / (grid[1]-grid[0])**2
+
+    # march in time between output times
+    result = np.empty((len(times), len(temp), depth.size))
+    time = 0.0
+    for i, nexttime in enumerate(times):
+        steps = int(np.ceil((nexttime-time)/maxdt))
+        if steps > 0:
+
+            # assemble tridiagonal matrix with fixed boundary values
+            dt = (nexttime-time) / steps
+            banded = np.zeros((3, size))
+            banded[0, 2:] = banded[2, :-2] = -coeff*dt
+            banded[1, 1:-1] = 1 + 2*coeff*dt
+            banded[1, [0, -1]] = 1
+
+            # solve for all ensemble members at once
+            for _ in range(steps):
+                heat = compute_theoretical_dissipation(temp, grid, e_xx, e_xz)
+                rhs = temp + dt*heat/(DENSITY*CAPACITY)
+                rhs[:, [0, -1]] = temp[:, [0, -1]]
+                temp = slinalg.solve_banded((1, 1), banded, rhs.T).T
+                temp = np.minimum(temp, melt_pt)
+            time = nexttime
+
+        # interpolate back to sensor depths
+        result[i] = sinterp.interp1d(grid, temp, axis=-1)(depth)
+
+    # restore ensemble dimensions
+    return result.swapaxes(0, 1).reshape(shape+result.shape[::2])
+
+
+def compute_heat_misfit(borehole, e_xz, e_xx=None, freq='1D', start=None,
+                        end=None, **kwargs):
+    """
+    Compute root-mean-square misfit in °C between observed temperatures and
+    an ensemble of heat model runs started from the first observed profile.
+
+    Parameters
+    ----------
+    borehole: string
+        Borehole name bh1, bh2, bh3 or err.
+    e_xz: scalar or array
+        Shear strain rates in s-1 to test.
+    e_xx: scalar or array, optional
+        Longitudinal strain rates in s-1, defaults to the estimated value.
+    freq: string
+        Frequency to resample observed temperatures to.
+    start, end: string, optional
+        Observation period, the first profile serving as initial condition.
+    **kwargs:
+        Additional keyword arguments are passed to simulate_temperature.
+
+    Returns
+    -------
+    misfit: array
+        Misfit for each strain rate combination.
+    """
+
+    # load observations for sensors with initial data and distinct depths
+    temp, depth, base = load_all(borehole)
+    temp = temp[start:end].resample(freq).mean()
+    temp = temp.loc[:, temp.iloc[0].notna() & ~depth.duplicated()]
+    depth = depth[temp.columns]
+
+    # run ensemble of heat model simulations
+    if e_xx is None:
+        e_xx = estimate_longitudinal_strain_rate()
+    times = (temp.index - temp.index[0]).total_seconds()
+    model = simulate_temperature(
+        temp.iloc[0].to_numpy(), depth, times, e_xx=e_xx, e_xz=e_xz, **kwargs)
+
+    # return root-mean-square misfit
+    return np.nanmean((model-temp.to_numpy())**2, axis=(-2, -1))**0.5
+
+
+# Background imagery methods
+# --------------------------
+
+def open_sentinel_image(image, extent=None, resolution=None):
+    """
+    Open a Sentinel-2 RGB image converted to a cloud-optimized GeoTIFF by the
+    data Makefile. Only tiles covering the requested extent are decoded, from
+    the coarsest overview level still finer than the requested resolution.
+
+    Parameters
+    ----------
+    image: string
+        Image name, e.g. '20160808_175915_456_S2A_RGB'.
+    extent: (west, east, south, north), optional
+        Map extent to read, defaults to the whole image.
+    resolution: scalar, optional
+        Target resolution in map units, defaults to the native resolution.
+    """
+    filename = f'../data/processed/{image}.tif'
+
+    # select overview level from decimation factors
+    level = None
+    if resolution is not None:
+        with rasterio.open(filename) as src:
+            pixel = max(src.res)
+            factors = src.overviews(1)
+        for i, factor in enumerate(factors):
+            if factor*pixel <= resolution:
+                level = i
+
+    # read window with a one-pixel margin
+    img = rioxarray.open_rasterio(filename, overview_level=level)
+    if extent is not None:
+        west, east, south, north = extent
+        pixel = max(map(abs, img.rio.resolution()))
+        img = img.sel(x=slice(west-pixel, east+pixel),
+                      y=slice(north+pixel, south-pixel))
+    return img.load().rename('band_data')
+
+
+def plot_sentinel_image(ax, image, **kwargs):
+    """Plot Sentinel-2 RGB image over axes extent at screen resolution."""
+    west, east = ax.get_xlim()
+    south, north = ax.get_ylim()
+    resolution = min(
+        (east-west)/ax.bbox.width, (north-south)/ax.bbox.height)
+    img = open_sentinel_image(
+        image, extent=(west, east, south, north), resolution=resolution)
+    img.plot.imshow(ax=ax, add_labels=False, **kwargs)
+    ax.set_xlim(west, east)
+    ax.set_ylim(south, north)
+    return img
+
+
 # Complete plot methods
 # ---------------------
 
@@ -359,9 +1105,10 @@ def plot_bowdoin_map(ax, boreholes=None, colors=None, season='spring'):
         'summer': ('w', '20160808_175915_456_S2A_RGB'),
         'spring': ('k', '20170310_174129_456_S2A_RGB')}[season]
 
-    # plot Sentinel image data
-    img = xr.open_dataarray(f'../data/native/{image}.jpg').astype(int)
-    img.plot.imshow(add_labels=False, ax=ax, interpolation='bilinear')
+    # set axes extent and plot Sentinel image data
+    ax.set_xlim(508e3, 512e3)
+    ax.set_ylim(8621e3, 8626e3+2e3/3)
+    img = plot_sentinel_image(ax, image, interpolation='bilinear')
 
     # add camp and boreholes locations
     crs = '+proj=utm +zone=19'
@@ -376,12 +1123,11 @@ def plot_bowdoin_map(ax, boreholes=None, colors=None, season='spring'):
                 text=f'20{year}', point='se' if bh == 'bh1' else 'nw')
 
     # set axes properties
-    ax.set_xlim(508e3, 512e3)
-    ax.set_ylim(8621e3, 8626e3+2e3/3)
     ax.set_xticks([])
     ax.set_yticks([])
 
-    # add scale bar
+    # add scale bar using hyoga xarray accessor
+    bowlazy.load(hyoga)
     img.to_dataset().hyoga.plot.scale_bar(ax=ax, color=color)
 
 
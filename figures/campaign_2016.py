@@ -4,7 +4,6 @@
 # (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
 # coding: utf-8
 
-import pandas as pd
 import matplotlib.pyplot as plt
 import util as ut
 
@@ -37,15 +36,12 @@ depth_base = bowdef_utils.load_depth('pressure', bh).squeeze()
 
 # ignore two lowest units on upper borehole
 broken = ['UI01', 'UI02', 'UI03']
-depth.drop(broken, inplace=True)
-exz.drop(broken, axis='columns', inplace=True)
 
 # fit to a Glen's law
-n, A = bowdef_utils.glenfit(depth, exz.T)
+n, A = bowdef_utils.glenfit(depth, exz, broken=broken)
 
 # calc deformation velocity
 vdef = bowdef_utils.vsia(0.0, depth_base, n, A)
-vdef = pd.Series(index=exz.index, data=vdef)
 
 # plot
 vdef.plot(ax=ax, c=c)
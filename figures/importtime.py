@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""Benchmark figure script startup times using python -X importtime."""
+
+import argparse
+import glob
+import subprocess
+import sys
+
+
+def parse_importtime(stderr, module):
+    """
+    Parse importtime output and return the cumulative import time of a module
+    in seconds, and a list of its direct imports sorted by decreasing time.
+    """
+    # nested imports are listed before the module importing them
+    children = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[12:].split('|')
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        if level == 1:
+            children.append((int(cumulative) * 1e-6, name.strip()))
+        elif level == 0 and name.strip() == module:
+            return int(cumulative) * 1e-6, sorted(children, reverse=True)
+        elif level == 0:
+            children = []
+    raise ValueError(f'{module} not found in importtime output.')
+
+
+def measure(module, repeat=3):
+    """
+    Import module in new interpreters and return the best cumulative import
+    time, its heaviest direct imports, and an error message if it failed.
+    """
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, check=False, text=True)
+        if proc.returncode:
+            return None, [], proc.stderr.strip().splitlines()[-1]
+        total, children = parse_importtime(proc.stderr, module)
+        if best is None or total < best[0]:
+            best = total, children
+    return (*best, None)
+
+
+def main():
+    """Main program called during execution."""
+
+    # parse arguments
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('scripts', nargs='*', help='scripts to benchmark')
+    parser.add_argument('-n', '--repeat', type=int, default=3,
+                        help='number of imports to keep the best time of')
+    parser.add_argument('-t', '--top', type=int, default=3,
+                        help='number of heaviest imports to list')
+    args = parser.parse_args()
+
+    # skip executable scripts plotting on import
+    scripts = args.scripts or sorted(glob.glob('bow*.py'))
+    for script in scripts:
+        with open(script, encoding='utf-8') as file:
+            source = file.read()
+        if source.startswith('#!') and (
+                "if __name__ == '__main__':" not in source):
+            print(f'{script:24s}   skipped (no main guard)')
+            continue
+
+        # print cumulative and heaviest import times
+        total, children, error = measure(script[:-3], repeat=args.repeat)
+        if error:
+            print(f'{script:24s}   failed ({error})')
+            continue
+        heaviest = ', '.join(
+            f'{name} {time*1e3:.0f}' for time, name in children[:args.top])
+        print(f'{script:24s} {total*1e3:5.0f} ms ({heaviest})')
+
+
+if __name__ == '__main__':
+    main()
@@ -8,46 +8,44 @@
 import sys
 import os.path
 import numpy as np
-import matplotlib as mpl
 import matplotlib.pyplot as plt
 import absplots as apl
 
+import render
+
 # import figure utils by relative path
-# pylint: disable=import-error, no-name-in-module, wrong-import-position
+# pylint: disable=import-error, wrong-import-position
 sys.path.append(os.path.join('..', 'figures'))
-import util.com  # noqa
-import util.geo  # noqa
-import util.str  # noqa
-# pylint: enable=import-error, no-name-in-module, wrong-import-position
-# pylint: disable=no-member
+import bowstr_utils  # noqa
+import bowtem_utils  # noqa
+# pylint: enable=import-error, wrong-import-position
 
 
 class CustomAnimation():
     """Adapted from: https://izziswift.com/how-to-animate-a-scatter-plot/."""
 
     def __init__(self):
-        """Construct the animation."""
+        """Precompute frame data as arrays."""
 
         # load filtered pressure series
-        pres = util.str.load().resample('1H').mean()
+        pres = bowstr_utils.load().resample('1h').mean()
         pres = pres['20150302':'20150329'].dropna(axis=1)
-        pres = util.str.filter(pres, cutoff=1/12)
+        pres = bowstr_utils.butter(pres, cutoff=1/12)
         self.pres = pres
-        tide = util.str.load_pituffik_tides(unit='m').resample('1H').mean()
-        self.tide = tide
-
-        # initialize figure
-        self.fig = self.setup()
-        self.update(pres.index[0])
+        tide = bowstr_utils.load_pituffik_tides(unit='m')
+        tide = tide.resample('1h').mean().reindex(pres.index)
 
-        # setup funcanimation
-        self.ani = mpl.animation.FuncAnimation(
-            self.fig, self.update, blit=True, frames=pres.index,
-            interval=1000/25)
+        # precompute marker sizes, sea levels and date tags
+        self.sizes = np.clip(64 + 32*pres.to_numpy(), 0, 128)
+        self.levels = 10 * tide.to_numpy()
+        self.dates = pres.index.strftime('%Y-%m-%d %H:%M:%S')
 
     def preview(self, filename):
         """Save the initial animation frame as a figure."""
-        self.fig.savefig(filename)
+        fig = self.setup()
+        self.update(0)
+        fig.savefig(filename)
+        plt.close(fig)
 
     def setup(self):
         """Draw boreholes long profile with intrumental setup."""
@@ -56,17 +54,17 @@ class CustomAnimation():
         fig, ax = apl.subplots_mm(figsize=(96, 54), dpi=508)
 
         # plot vertical lines symbolising the boreholes
-        locations = util.geo.read_locations_dict('../data/locations.gpx')
+        locations = bowtem_utils.load_waypoints()
         for bh in ('bh1', 'bh3'):
-            surf = locations['B14'+bh.upper()].elevation
-            base = surf - util.com.load_file(
-                '../data/processed/bowdoin.{}.inc.base.csv'.format(bh)
+            surf = locations.ele['B14'+bh.upper()]
+            base = surf - bowtem_utils.load(
+                '../data/processed/bowdoin.{}.inc.base.nc'.format(bh)
                 ).iloc[0].squeeze()
             dist = dict(bh1=2, bh3=1.84)[bh]
             ax.plot([dist, dist], [base, surf], 'k-_')
 
         # add scatter plot
-        elev = surf - util.str.load(variable='dept').iloc[0]
+        elev = surf - bowstr_utils.load(variable='dept').iloc[0]
         elev = elev[self.pres.columns]
         dist = 1.84 + elev.index.to_series().str.startswith('U') * 0.16
         colors = plt.get_cmap('tab10')(range(len(elev)))
@@ -102,28 +100,20 @@ class CustomAnimation():
         # return figure
         return fig
 
-    def update(self, date):
-        """Update the scatter plot."""
-
-        # update scatter plot
-        sizes = 64 + 32*self.pres.loc[date]
-        sizes = np.clip(sizes, 0, 128)
-        self.scatter.set_sizes(sizes)
-
-        # update tidal sea level
-        self.sealevel.set_ydata([self.tide.loc[date]*10]*2)
-
-        # update date tag
-        self.datetag.set_text(date)
-
-        return self.scatter, self.sealevel
+    def update(self, frame):
+        """Update animated artists in place."""
+        self.scatter.set_sizes(self.sizes[frame])
+        self.sealevel.set_ydata([self.levels[frame]]*2)
+        self.datetag.set_text(self.dates[frame])
+        return self.scatter, self.sealevel, self.datetag
 
 
 def main():
     """Main program called during execution."""
     ani = CustomAnimation()
     ani.preview(__file__[:-3] + '_main.png')
-    ani.ani.save(__file__[:-3] + '_main.mp4')
+    renderer = render.FrameRenderer(ani, range(len(ani.dates)))
+    render.assemble(__file__[:-3], renderer.iter_frames(), len(ani.dates))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,309 @@
+#!/usr/bin/env python
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""Render Bowdoin Glacier animations in parallel and add bumpers."""
+
+import argparse
+import collections
+import contextlib
+import glob
+import itertools
+import multiprocessing
+import os.path
+import subprocess
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+
+import stills
+
+# render frames off-screen in all processes
+mpl.use('agg')
+
+
+# Worker process methods
+# ----------------------
+
+_WORKER = {}
+
+
+def _init_worker(animation, frame):
+    """Draw the static figure background once per worker process."""
+    fig = animation.setup()
+    artists = animation.update(frame)
+    for artist in artists:
+        artist.set_animated(True)
+    fig.canvas.draw()
+    _WORKER.update(
+        animation=animation, fig=fig,
+        background=fig.canvas.copy_from_bbox(fig.bbox))
+
+
+def _render_frame(frame):
+    """Blit animated artists on the background and return RGB pixels."""
+    fig = _WORKER['fig']
+    fig.canvas.restore_region(_WORKER['background'])
+    for artist in _WORKER['animation'].update(frame):
+        fig.draw_artist(artist)
+    return buffer_rgb(fig)
+
+
+def _save_frame(frame, filename):
+    """Render one frame and save it as a PNG image."""
+    plt.imsave(filename, _render_frame(frame))
+
+
+# Parallel FrameRenderer class
+# ----------------------------
+
+class FrameRenderer():
+    """
+    Render animation frames in a process pool and stream them to ffmpeg.
+
+    The animation object must provide a setup() method returning a new figure
+    and an update(frame) method returning the sequence of animated artists
+    after updating them in place. All other artists are drawn only once per
+    worker, and frame data should be precomputed so that update() only
+    indexes arrays.
+    """
+
+    def __init__(self, animation, frames, fps=25, processes=None):
+        """Initialize with an animation object and a sequence of frames."""
+        self.animation = animation
+        self.frames = frames
+        self.fps = fps
+        self.processes = processes or os.cpu_count()
+
+    def pool(self):
+        """Return a process pool with initialized worker figures."""
+        return multiprocessing.Pool(
+            self.processes, initializer=_init_worker,
+            initargs=(self.animation, self.frames[0]))
+
+    def chunksize(self):
+        """Return the number of consecutive frames sent to each worker."""
+        return max(1, len(self.frames) // (4*self.processes))
+
+    def shape(self):
+        """Return frame width and height in pixels."""
+        fig = self.animation.setup()
+        width, height = fig.canvas.get_width_height(physical=True)
+        plt.close(fig)
+        return width, height
+
+    def iter_frames(self):
+        """Yield RGB frame arrays in order as they are rendered."""
+        with self.pool() as pool:
+            yield from pool.imap(
+                _render_frame, self.frames, chunksize=self.chunksize())
+
+    def save(self, filename, codec='libx264', quality=18):
+        """Pipe raw frames into ffmpeg and encode them to a movie file."""
+        width, height = self.shape()
+        cmd = [
+            'ffmpeg', '-y', '-v', 'error', '-f', 'rawvideo',
+            '-pix_fmt', 'rgb24', '-s', f'{width}x{height}',
+            '-r', str(self.fps), '-i', '-', '-c:v', codec,
+            '-crf', str(quality), '-pix_fmt', 'yuv420p', filename]
+        with subprocess.Popen(cmd, stdin=subprocess.PIPE) as proc:
+            for frame in self.iter_frames():
+                proc.stdin.write(frame)
+            proc.stdin.close()
+        if proc.returncode:
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+    def save_frames(self, dirname):
+        """Save numbered PNG frames from worker processes."""
+        os.makedirs(dirname, exist_ok=True)
+        filenames = [os.path.join(dirname, f'{i:06d}.png')
+                     for i in range(len(self.frames))]
+        with self.pool() as pool:
+            pool.starmap(_save_frame, zip(self.frames, filenames),
+                         chunksize=self.chunksize())
+
+
+# Movie assembly methods
+# ----------------------
+
+def buffer_rgb(fig):
+    """Return current canvas pixels as an RGB array without redrawing."""
+    return np.ascontiguousarray(np.asarray(fig.canvas.buffer_rgba())[..., :3])
+
+
+def rasterize(fig):
+    """Draw a static figure and return its pixels as an RGB array."""
+    fig.canvas.draw()
+    return buffer_rgb(fig)
+
+
+def decode_frames(iargs, width, height):
+    """Yield RGB frame arrays decoded by ffmpeg from input arguments."""
+    cmd = ['ffmpeg', '-v', 'error', *iargs,
+           '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-']
+    size = width * height * 3
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE) as proc:
+        while len(buffer := proc.stdout.read(size)) == size:
+            yield np.frombuffer(buffer, dtype='u1').reshape(height, width, 3)
+
+
+def probe(iargs, entries='width,height'):
+    """Return stream properties from ffprobe as a list of integers."""
+    cmd = ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+           '-show_entries', f'stream={entries}', '-of', 'csv=p=0', *iargs]
+    output = subprocess.run(cmd, capture_output=True, check=True, text=True)
+    return [int(value) for value in output.stdout.strip().split(',')]
+
+
+def fade_frames(frames, fade=12):
+    """Yield frames with linear fade in and fade out effects."""
+    queue = collections.deque()
+    for i, frame in enumerate(frames):
+        queue.append(frame if i >= fade else (frame*(i/fade)).astype('u1'))
+        if len(queue) > fade:
+            yield queue.popleft()
+    for i, frame in enumerate(queue, start=fade-len(queue)):
+        yield (frame*((fade-1-i)/fade)).astype('u1')
+
+
+def hold_frames(frames, hold=25):
+    """Yield frames cloning the first and last frames hold times."""
+    frames = iter(frames)
+    frame = next(frames)
+    yield from itertools.repeat(frame, hold)
+    yield frame
+    for frame in frames:
+        yield frame
+    yield from itertools.repeat(frame, hold)
+
+
+def assemble_command(prefix, width, height, count, fps=25, hold=25,
+                     speedup=10):
+    """
+    Return the ffmpeg command encoding raw RGB frames read from standard
+    input to a full and an accelerated movie, the latter cut to the main
+    scene after a four-second title bumper and a hold.
+    """
+
+    # cut main scene without hold for the accelerated version
+    start = 4*fps + hold
+    filt = (
+        f'[0]split[full][fast];[fast]trim=start_frame={start}'
+        f':end_frame={start+count},setpts=(PTS-STARTPTS)/{speedup},'
+        f'fps={fps},scale=1920:1080[accel]')
+
+    # encode both versions from a single raw video stream
+    return [
+        'ffmpeg', '-y', '-v', 'error', '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24', '-s', f'{width}x{height}', '-r', str(fps),
+        '-i', '-', '-filter_complex', filt,
+        '-map', '[full]', '-pix_fmt', 'yuv420p', '-c:v', 'libx264',
+        prefix+'.mp4',
+        '-map', '[accel]', '-pix_fmt', 'yuv420p', '-c:v', 'libx264',
+        f'{prefix}_x{speedup}.mp4']
+
+
+def assemble(prefix, frames, count, subtitle=None, fps=25, fade=12, hold=25,
+             speedup=10):
+    """
+    Add bumpers and fading effects to main animation frames, and encode them
+    in a single ffmpeg pass to a full and an accelerated movie.
+
+    Parameters
+    ----------
+    prefix: string
+        Output file prefix and metadata YAML file name without extension.
+    frames: iterable
+        Main animation frames as RGB arrays.
+    count: int
+        Number of main animation frames, used to cut the accelerated movie.
+    subtitle: string, optional
+        Subfield of the metadata containing the title bumper subtitle.
+    fps: int
+        Frame rate in frames per second.
+    fade: int
+        Number of frames for fade in and fade out effects.
+    hold: int
+        Number of frames to hold in the beginning and end of the main scene.
+    speedup: int
+        Acceleration factor of the accelerated movie.
+
+    Raises
+    ------
+    ValueError
+        If any bumper or main frame differs in size from the first frame.
+    """
+
+    # get frame size from the first frame
+    frames = iter(frames)
+    first = next(frames)
+    height, width, _ = first.shape
+    frames = itertools.chain([first], frames)
+
+    # prepare bumper frames and check their size
+    bumpers = stills.bumpers(prefix+'.yaml', height=height, subtitle=subtitle)
+    bumpers = {name: rasterize(fig) for name, fig in bumpers.items()}
+    plt.close('all')
+    for name, bumper in bumpers.items():
+        if bumper.shape != first.shape:
+            raise ValueError(
+                f"Bumper {name} size {bumper.shape[1::-1]} differs from "
+                f"frame size {(width, height)}.")
+
+    # chain faded bumpers and main scene
+    scenes = [
+        itertools.repeat(bumpers['head'], 4*fps),
+        hold_frames(frames, hold=hold),
+        itertools.repeat(bumpers['refs'], 3*fps),
+        itertools.repeat(bumpers['disc'], 3*fps),
+        itertools.repeat(bumpers['bysa'], 3*fps)]
+    scenes = [fade_frames(scene, fade=fade) for scene in scenes]
+
+    # encode frames, stopping ffmpeg if any has a different size
+    cmd = assemble_command(prefix, width, height, count, fps=fps, hold=hold,
+                           speedup=speedup)
+    with subprocess.Popen(cmd, stdin=subprocess.PIPE) as proc:
+        for i, frame in enumerate(itertools.chain(*scenes)):
+            if frame.shape != first.shape:
+                proc.kill()
+                with contextlib.suppress(BrokenPipeError):
+                    proc.stdin.close()
+                raise ValueError(
+                    f"Frame {i} size {frame.shape[1::-1]} differs from "
+                    f"frame size {(width, height)}.")
+            proc.stdin.write(frame)
+        proc.stdin.close()
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def main():
+    """Main program for command-line execution."""
+
+    # parse arguments
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('prefix', nargs='?', default='anim',
+                        help='animation name and metadata file prefix')
+    parser.add_argument('subtitle', nargs='?',
+                        help='subfield containing subtitle')
+    args = parser.parse_args()
+
+    # look for input movie or frames
+    if os.path.isfile(args.prefix+'_main.mp4'):
+        iargs = ['-i', args.prefix+'_main.mp4']
+        count, = probe(['-count_packets', *iargs], entries='nb_read_packets')
+    else:
+        pattern = os.path.expanduser(f'~/anim/{args.prefix}/??????.png')
+        count = len(glob.glob(pattern))
+        iargs = ['-pattern_type', 'glob', '-i', pattern]
+
+    # decode main frames once and assemble movies
+    width, height = probe(iargs)
+    frames = decode_frames(iargs, width, height)
+    assemble(args.prefix, frames, count, subtitle=args.subtitle)
+
+
+if __name__ == '__main__':
+    main()
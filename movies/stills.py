@@ -25,7 +25,7 @@ def bumper_init():
     return fig, ax
 
 
-def bumper_main(prefix, info, subtitle=None):
+def bumper_main(info, subtitle=None):
     """Prepare title animation bumper."""
 
     # initialize figure
@@ -41,12 +41,11 @@ def bumper_main(prefix, info, subtitle=None):
     if subtitle not in (None, 'none'):
         ax.text(0, 8, info['Subtitle'][subtitle], ha='center', va='center')
 
-    # save
-    fig.savefig(prefix+'_head.png')
-    plt.close(fig)
+    # return figure
+    return fig
 
 
-def bumper_bysa(prefix, info):
+def bumper_bysa(info):
     """Prepare CC-BY-SA animation bumper."""
 
     # initialize figure
@@ -83,12 +82,11 @@ def bumper_bysa(prefix, info):
     ax.text(0, -32, info['License link'], ha='center',
             weight='bold', family=['DeJaVu Sans'])
 
-    # save
-    fig.savefig(prefix+'_bysa.png')
-    plt.close(fig)
+    # return figure
+    return fig
 
 
-def bumper_disc(prefix, info):
+def bumper_disc(info):
     """Prepare disclaimer animation bumper."""
 
     # initialize figure
@@ -98,12 +96,11 @@ def bumper_disc(prefix, info):
     ax.text(0, 0, info['Disclaimer'], ha='center', va='center',
             linespacing=3.0)
 
-    # save
-    fig.savefig(prefix+'_disc.png')
-    plt.close(fig)
+    # return figure
+    return fig
 
 
-def bumper_refs(prefix, info):
+def bumper_refs(info):
     """Prepare references animation bumper."""
 
     # initialize figure
@@ -122,9 +119,29 @@ def bumper_refs(prefix, info):
     ax.text(-48, 0, col2, linespacing=1.5, va='center', ha='left')
     ax.text(+80, 0, col3, linespacing=1.5, va='center', ha='right')
 
-    # save
-    fig.savefig(prefix+'_refs.png')
-    plt.close(fig)
+    # return figure
+    return fig
+
+
+def bumpers(metafile, height=1080, subtitle=None):
+    """Return a dictionary of bumper figures in order of appearance."""
+
+    # set default font properties
+    plt.rc('axes', grid=False)
+    plt.rc('figure', dpi=height/108*25.4)
+    plt.rc('font', size=12)
+    plt.rc('text', color='0.75')
+
+    # import text elements
+    with open(metafile) as yamlfile:
+        info = yaml.safe_load(yamlfile)
+
+    # assemble bumpers
+    return {
+        'head': bumper_main(info, subtitle=subtitle),
+        'refs': bumper_refs(info),
+        'disc': bumper_disc(info),
+        'bysa': bumper_bysa(info)}
 
 
 def main():
@@ -138,22 +155,13 @@ def main():
     parser.add_argument('--subtitle', help='subfield containing subtitle')
     args = parser.parse_args()
 
-    # set default font properties
-    plt.rc('axes', grid=False)
-    plt.rc('figure', dpi=args.height/108*25.4)
-    plt.rc('font', size=12)
-    plt.rc('text', color='0.75')
-
-    # import text elements
-    with open(args.metafile) as metafile:
-        info = yaml.safe_load(metafile)
-
-    # assemble bumpers
+    # assemble and save bumpers
     prefix = args.metafile.replace('.yaml', '')
-    bumper_main(prefix, info, subtitle=args.subtitle)
-    bumper_bysa(prefix, info)
-    bumper_disc(prefix, info)
-    bumper_refs(prefix, info)
+    figures = bumpers(
+        args.metafile, height=args.height, subtitle=args.subtitle)
+    for name, fig in figures.items():
+        fig.savefig(f'{prefix}_{name}.png')
+        plt.close(fig)
 
 
 if __name__ == '__main__':
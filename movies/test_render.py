@@ -0,0 +1,125 @@
+# Copyright (c) 2026, Julien Seguinot (juseg.dev)
+# Creative Commons Attribution-ShareAlike 4.0 International License
+# (CC BY-SA 4.0, http://creativecommons.org/licenses/by-sa/4.0/)
+
+"""Test movie assembly with a dry-run ffmpeg stand-in."""
+
+import unittest
+import unittest.mock
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import render
+
+
+class DryRunStdin():
+    """Record the size of data written instead of piping it."""
+
+    def __init__(self):
+        """Initialize an empty record."""
+        self.sizes = []
+        self.closed = False
+
+    def write(self, data):
+        """Record the size of written data in bytes."""
+        self.sizes.append(memoryview(data).nbytes)
+
+    def close(self):
+        """Mark the stream as closed."""
+        self.closed = True
+
+
+class DryRunPopen():
+    """Record the ffmpeg command and written frames instead of running it."""
+
+    last = None
+
+    def __init__(self, cmd, stdin=None):
+        """Record the command and open a dry-run input stream."""
+        self.cmd = cmd
+        self.stdin = DryRunStdin()
+        self.returncode = 0
+        self.killed = False
+        DryRunPopen.last = self
+
+    def __enter__(self):
+        """Return the process itself as context manager."""
+        return self
+
+    def __exit__(self, *args):
+        """Do nothing on exit."""
+
+    def kill(self):
+        """Record that the process was killed."""
+        self.killed = True
+        self.returncode = -9
+
+
+def dry_run_bumpers(width, height):
+    """Return a function building blank bumper figures of a given size."""
+    def bumpers(metafile, height=height, subtitle=None):
+        # pylint: disable=unused-argument
+        return {name: plt.figure(figsize=(width/100, height/100), dpi=100)
+                for name in ('head', 'refs', 'disc', 'bysa')}
+    return bumpers
+
+
+class TestAssemble(unittest.TestCase):
+    """Test ffmpeg command line, frame stream and frame size checks."""
+
+    width, height, count, fps, hold = 192, 108, 10, 5, 2
+
+    def assemble(self, frames, bumper_width=None):
+        """Assemble frames with dry-run bumpers and ffmpeg."""
+        bumpers = dry_run_bumpers(bumper_width or self.width, self.height)
+        with unittest.mock.patch.object(render.stills, 'bumpers', bumpers), \
+                unittest.mock.patch.object(
+                    render.subprocess, 'Popen', DryRunPopen):
+            render.assemble('anim', frames, self.count, fps=self.fps,
+                            fade=2, hold=self.hold, speedup=10)
+        return DryRunPopen.last
+
+    def frames(self, width=None, bad=None):
+        """Return main frames, with one of a different width if bad."""
+        return [np.zeros((self.height, width if i == bad else self.width, 3),
+                         dtype='u1') for i in range(self.count)]
+
+    def test_assemble_command(self):
+        """Build the ffmpeg command for both movie versions."""
+        cmd = render.assemble_command('anim', 1920, 1080, 100)
+        self.assertEqual(cmd[cmd.index('-s')+1], '1920x1080')
+        self.assertEqual(cmd[cmd.index('-r')+1], '25')
+        self.assertIn('trim=start_frame=125:end_frame=225',
+                      cmd[cmd.index('-filter_complex')+1])
+        self.assertEqual(cmd[-1], 'anim_x10.mp4')
+        self.assertIn('anim.mp4', cmd)
+
+    def test_assemble_writes_all_frames(self):
+        """Write bumpers and held main frames to a single ffmpeg stream."""
+        proc = self.assemble(self.frames())
+        self.assertEqual(proc.cmd, render.assemble_command(
+            'anim', self.width, self.height, self.count, fps=self.fps,
+            hold=self.hold, speedup=10))
+        self.assertEqual(len(proc.stdin.sizes),
+                         13*self.fps + self.count + 2*self.hold)
+        self.assertEqual(set(proc.stdin.sizes),
+                         {self.width*self.height*3})
+        self.assertTrue(proc.stdin.closed)
+
+    def test_assemble_rejects_mismatched_frame(self):
+        """Stop ffmpeg and raise if a main frame differs in size."""
+        with self.assertRaisesRegex(ValueError, 'Frame .* differs'):
+            self.assemble(self.frames(width=190, bad=5))
+        self.assertTrue(DryRunPopen.last.killed)
+
+    def test_assemble_rejects_mismatched_bumper(self):
+        """Raise before encoding if bumpers differ from frames in size."""
+        DryRunPopen.last = None
+        with self.assertRaisesRegex(ValueError, 'Bumper head .* differs'):
+            self.assemble(self.frames(), bumper_width=200)
+        self.assertIsNone(DryRunPopen.last)
+
+
+if __name__ == '__main__':
+    unittest.main()